@@ -1,64 +1,59 @@
-from matplotlib import pyplot as plt
-from scipy.fft import rfft, rfftfreq, irfft
-from scipy.io.wavfile import write
 import numpy as np
 
+from filters import notch
+from pcm import to_pcm
+from plotting import save_plot
+from spectral import spectral_context
+from synth import synthesize
+from wavmap import create_wav
+
 SAMPLE_RATE = 44100 # Hertz
 DURATION = 5 # Seconds
 
-def generate_sine_wave(freq, sample_rate, duration):
-    x = np.linspace(0, duration, sample_rate*duration, endpoint=False)
-    frequencies = x*freq
-    y = np.sin(2*np.pi*frequencies)
-    return x, y
-
 # Create a signal at 400 Hz with distortion 4000 Hz
 
-_, nice_tone = generate_sine_wave(400, SAMPLE_RATE, DURATION)
-_, noise_tone = generate_sine_wave(4000, SAMPLE_RATE, DURATION)
-noise_tone = noise_tone * 0.3
-mixed_tone = nice_tone + noise_tone
+mixed_tone = synthesize([400, 4000], [1, 0.3], SAMPLE_RATE, DURATION)
 
-normalised_tone = np.int16(mixed_tone/mixed_tone.max() * 32767)
+normalised_tone = to_pcm(mixed_tone)
 
-plt.plot(normalised_tone[:1000])
-plt.show()
+save_plot(normalised_tone[:1000], name="applying_fft/1_mixed_tone")
 
-#write("mysinewave.wav", SAMPLE_RATE, normalised_tone)
+#create_wav("mysinewave.wav", SAMPLE_RATE, len(normalised_tone))[:, 0] = normalised_tone
 
 
 # Using the Fast Fourier Transform (FFT)
 # Now, we use the FFT to remove the noise from the signal
+# (stream_filter.py does the same steps block by block for long recordings)
 
 # Number of samples in normalized_tone
 n = SAMPLE_RATE * DURATION
 
-yf = rfft(normalised_tone)
-xf = rfftfreq(n, 1/SAMPLE_RATE)
+spectrum = spectral_context(n, SAMPLE_RATE)
+yf = spectrum.forward(normalised_tone)
+xf = spectrum.freqs
 
-plt.plot(xf, np.abs(yf))
-plt.show()
+save_plot(xf, np.abs(yf), "applying_fft/2_spectrum")
 
 # Filtering the Signal
 # Looking at the frequency domain graph, we can remove the high-pitched noise 
 
-points_per_freq = len(xf) / (SAMPLE_RATE / 2)
-target_idx = int(points_per_freq * 4000)
-
-yf[target_idx - 1 : target_idx + 2] = 0
+# Zero the 4000 Hz bin and one bin either side of it
+# (filters.FIRFilter([(3900, 4100)], SAMPLE_RATE).apply() does the same job
+# without relying on the noise landing exactly on a bin)
+notch(4000, SAMPLE_RATE, n).apply_spectrum(yf)
 
-plt.plot(xf, np.abs(yf))
-plt.show()
+save_plot(xf, np.abs(yf), "applying_fft/3_filtered_spectrum")
 
 
 
 # Applying the Inverse Fast Fourier Transform (IFFT)
 
-new_sig = irfft(yf)
+new_sig = spectrum.inverse(yf)
 
-plt.plot(new_sig[:1000])
-plt.show()
+save_plot(new_sig[:1000], name="applying_fft/4_clean_tone")
 
-norm_new_sig = np.int16(new_sig/new_sig.max() * 32767)
-write("clean.wav", SAMPLE_RATE, norm_new_sig)
+# Normalised straight into the mapped output file
+clean = create_wav("clean.wav", SAMPLE_RATE, len(new_sig))
+to_pcm(new_sig, out=clean[:, 0])
+clean.flush()
 
@@ -0,0 +1,161 @@
+# Headless benchmark of the denoise pipeline in applying_fft.py
+#
+#   python benchmark.py                                 # 1 s .. 1 h, float32/float64, 1 and all threads
+#   python benchmark.py --lengths 1 60 --dtypes float32 --workers 1
+#   python benchmark.py --compare media/benchmarks/<earlier>.json
+#
+# Each stage of the pipeline (synthesis, normalise, fft, filter, ifft, write,
+# plus the FIR filter as the alternative to fft/filter/ifft) is timed on its own
+# for every combination of length, dtype and scipy.fft thread count, best of
+# --repeat runs. Throughput is in samples per second. Peak memory is what NumPy
+# allocated on top of what was already live while the stage ran, as seen by
+# tracemalloc. Results are written as JSON to media/benchmarks, and --compare
+# lists the stages that got slower since an earlier file.
+#
+
+
+from pathlib import Path
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import scipy
+
+from filters import FIRFilter, notch
+from pcm import to_pcm
+from spectral import SpectralContext
+from synth import SAMPLE_RATE, synthesize
+from wavmap import create_wav
+
+BENCH_DIR = Path("media") / "benchmarks"
+LENGTHS = (1, 10, 60, 600, 3600) # Seconds
+DTYPES = ("float32", "float64")
+REPEAT = 3
+SLOWER = 1.1 # Ratio to an earlier run that counts as a regression
+
+
+def measure(function, repeat=REPEAT):
+    # Returns (result of the last run, best time, peak bytes allocated)
+    best, peak, result = float("inf"), 0, None
+    for _ in range(repeat):
+        result = None
+        tracemalloc.reset_peak()
+        live = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - live)
+    return result, best, peak
+
+
+def run_pipeline(seconds, dtype, workers, directory, repeat=REPEAT):
+    n = int(seconds * SAMPLE_RATE)
+    context = SpectralContext(n, SAMPLE_RATE, workers=workers)
+    mask = notch(4000, SAMPLE_RATE, n, workers=workers)
+    fir = FIRFilter([(3900, 4100)], SAMPLE_RATE, workers=workers)
+    path = Path(directory) / "clean.wav"
+
+    def write(signal):
+        out = create_wav(path, SAMPLE_RATE, n)
+        to_pcm(signal, out=out[:, 0])
+        out.flush()
+
+    results = {}
+    signal, results["synthesis"], synthesis_peak = measure(
+        lambda: synthesize([400, 4000], [1, 0.3], SAMPLE_RATE, seconds, dtype=dtype), repeat
+    )
+    peaks = {"synthesis": synthesis_peak}
+    # The rest runs on the float signal so the dtype carries through, where
+    # applying_fft.py transforms the int16 copy
+    _, results["normalise"], peaks["normalise"] = measure(lambda: to_pcm(signal), repeat)
+    yf, results["fft"], peaks["fft"] = measure(lambda: context.forward(signal), repeat)
+    _, results["filter"], peaks["filter"] = measure(lambda: mask.apply_spectrum(yf), repeat)
+    clean, results["ifft"], peaks["ifft"] = measure(lambda: context.inverse(yf), repeat)
+    _, results["write"], peaks["write"] = measure(lambda: write(clean), repeat)
+    # The lambdas above still refer to these, so drop the arrays rather than the names
+    yf = clean = None
+    _, results["fir"], peaks["fir"] = measure(lambda: fir.apply(signal), repeat)
+    return [
+        {
+            "stage": stage, "seconds": seconds, "samples": n, "dtype": dtype, "workers": workers,
+            "time": elapsed, "samples_per_s": n / elapsed, "peak_bytes": peaks[stage],
+        }
+        for stage, elapsed in results.items()
+    ]
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results, earlier):
+    # Returns (record, earlier time) for every run that got slower by SLOWER or more
+    def key(record):
+        return record["stage"], record["samples"], record["dtype"], record["workers"]
+
+    before = {key(record): record["time"] for record in earlier}
+    return [
+        (record, before[key(record)]) for record in results
+        if key(record) in before and record["time"] >= SLOWER * before[key(record)]
+    ]
+
+
+def print_record(record):
+    print(
+        f"{record['stage']:<10} {record['seconds']:>7g} s {record['dtype']:>8} {record['workers']:>4} threads "
+        f"{record['time']:>9.4f} s {record['samples_per_s'] / 1e6:>9.1f} M/s {record['peak_bytes'] / (1 << 20):>9.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time every stage of the denoise pipeline.")
+    parser.add_argument("--lengths", nargs="+", type=float, default=LENGTHS, help="signal lengths in seconds")
+    parser.add_argument("--dtypes", nargs="+", default=DTYPES, choices=DTYPES)
+    parser.add_argument("--workers", nargs="+", type=int, default=sorted({1, os.cpu_count()}), help="scipy.fft threads")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("-o", "--output", type=Path, help=f"default: {BENCH_DIR}/<date>_<commit>.json")
+    parser.add_argument("--compare", type=Path, help="earlier results to check for regressions")
+    args = parser.parse_args()
+
+    env = environment()
+    results = []
+    tracemalloc.start()
+    with tempfile.TemporaryDirectory() as directory:
+        for seconds in args.lengths:
+            for dtype in args.dtypes:
+                for workers in args.workers:
+                    for record in run_pipeline(seconds, dtype, workers, directory, args.repeat):
+                        print_record(record)
+                        results.append(record)
+    tracemalloc.stop()
+
+    output = args.output or BENCH_DIR / f"{env['date'][:10]}_{env['commit'] or 'nogit'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"environment": env, "results": results}, indent=1))
+    print(f"results in {output}")
+
+    if args.compare:
+        slower = compare(results, json.loads(args.compare.read_text())["results"])
+        print(f"\n{len(slower)} runs at least {SLOWER - 1:.0%} slower than {args.compare}")
+        for record, earlier in slower:
+            print(f"  {record['stage']:<10} {record['seconds']:>7g} s {record['dtype']:>8} {record['workers']:>4} threads "
+                  f"{earlier:.4f} -> {record['time']:.4f} s")
@@ -0,0 +1,160 @@
+# Band-stop filtering in the frequency domain
+#
+# Replaces the hard-coded `yf[target_idx - 1 : target_idx + 2] = 0` in applying_fft.py.
+# A SpectralMask works out which rfft bins to zero once for a given sample rate and
+# signal length, then applies that to as many signals as you like:
+#
+#   mask = SpectralMask([(3900, 4100)], SAMPLE_RATE, n)
+#   clean = mask.apply(noisy)               # one signal
+#   clean = mask.apply_batch(library)       # (clips, n) array in one call
+#
+# Zeroing bins is a brick wall: it rings, and it only removes a tone cleanly when
+# the tone sits exactly on a bin. FIRFilter is the time-domain alternative with
+# the same apply()/apply_batch() interface. It designs a windowed-sinc kernel
+# for the bands and convolves with it by FFT overlap-add, in blocks whose FFT
+# size is picked for the fewest operations per output sample:
+#
+#   fir = FIRFilter([(3900, 4100)], SAMPLE_RATE)
+#   clean = fir.apply(noisy)
+#   smooth = lowpass(1000, SAMPLE_RATE).apply(noisy)
+#
+
+
+from scipy.fft import next_fast_len
+from scipy.signal import firwin
+import numpy as np
+
+from spectral import spectral_context, WORKERS
+
+NUM_TAPS = 4097 # About 50 Hz transition bands at 44.1 kHz with a Hamming window
+MAX_FFT = 1 << 20
+
+
+class _SpectralFilter:
+    # What SpectralMask and FIRFilter share: apply() on top of apply_batch(),
+    # and the rfft, multiply, irfft pass both filter with. Subclasses set
+    # self.context to the SpectralContext of their transform size.
+    def apply(self, signal):
+        signal = np.asarray(signal)
+        if signal.ndim != 1:
+            raise ValueError("apply() takes a 1-D signal, use apply_batch() for 2-D arrays")
+        return self.apply_batch(signal[None, :])[0]
+
+    def _filter_block(self, signals, gain, axis=-1):
+        # irfft(rfft(signals) * gain) along axis, zero-padding signals to the
+        # context's size
+        yf = self.context.forward(signals, axis)
+        yf *= gain
+        return self.context.inverse(yf, axis, overwrite_x=True)
+
+
+class SpectralMask(_SpectralFilter):
+    def __init__(self, bands, sample_rate, n, workers=WORKERS):
+        self.bands = [(float(low), float(high)) for low, high in bands]
+        self.sample_rate = sample_rate
+        self.n = n
+        self.context = spectral_context(n, sample_rate, workers=workers)
+
+        # Every bin from the low edge to the high edge of each band, inclusive
+        self.mask = np.ones(self.context.n_bins)
+        for band in self.bands:
+            self.mask[self.context.bins(band)] = 0
+
+    def removed_bins(self):
+        return np.flatnonzero(self.mask == 0)
+
+    def apply_spectrum(self, yf, axis=-1):
+        # Zeroes the masked bins of an rfft output in place and returns it
+        if yf.shape[axis] != len(self.mask):
+            raise ValueError(f"spectrum has {yf.shape[axis]} bins, mask was planned for {len(self.mask)}")
+        yf *= self._broadcast(yf.ndim, axis)
+        return yf
+
+    def apply_batch(self, signals, axis=-1):
+        # Filters every row (axis=-1) or column (axis=0) of a 2-D array with one
+        # rfft/irfft pair, e.g. a stack of clips or the channels of a recording.
+        signals = np.asarray(signals)
+        if signals.ndim != 2:
+            raise ValueError("apply_batch() takes a 2-D array of signals")
+        if signals.shape[axis] != self.n:
+            raise ValueError(f"signals have length {signals.shape[axis]}, mask was planned for {self.n}")
+
+        return self._filter_block(signals, self._broadcast(signals.ndim, axis), axis)
+
+    def _broadcast(self, ndim, axis):
+        shape = [1] * ndim
+        shape[axis] = len(self.mask)
+        return self.mask.reshape(shape)
+
+
+def notch(freq, sample_rate, n, width=1, workers=WORKERS):
+    # Zeroes the bin nearest `freq` and `width` bins either side of it, which with
+    # the defaults is exactly what applying_fft.py does by hand.
+    bin_width = spectral_context(n, sample_rate, workers=workers).bin_width
+    centre = round(freq / bin_width) * bin_width
+    return SpectralMask([(centre - width*bin_width, centre + width*bin_width)], sample_rate, n, workers)
+
+
+class FIRFilter(_SpectralFilter):
+    def __init__(self, bands, sample_rate, numtaps=NUM_TAPS, window="hamming", workers=WORKERS):
+        if numtaps % 2 == 0:
+            raise ValueError("numtaps must be odd, so the delay is a whole number of samples")
+
+        self.bands = sorted((float(low), float(high)) for low, high in bands)
+        self.sample_rate = sample_rate
+        self.numtaps = numtaps
+        self.delay = (numtaps - 1) // 2
+
+        # firwin takes the band edges in order and alternates pass/stop starting
+        # with a pass band at 0 Hz. A band reaching Nyquist leaves its top edge
+        # off, which makes the filter a low-pass.
+        nyquist = sample_rate / 2
+        edges = [edge for band in self.bands for edge in band if 0 < edge < nyquist]
+        pass_zero = not (self.bands and self.bands[0][0] <= 0)
+        self.kernel = firwin(numtaps, edges, window=window, pass_zero=pass_zero, fs=sample_rate)
+
+        self.fft_size, self.block_size = self.plan(numtaps)
+        self.context = spectral_context(self.fft_size, sample_rate, workers=workers)
+        self.kernel_spectrum = self.context.forward(self.kernel)
+
+    @staticmethod
+    def plan(numtaps, max_fft=MAX_FFT):
+        # Returns (fft size, samples per block). Each block of L samples costs
+        # one forward and one inverse FFT of size N >= L + numtaps - 1, so the
+        # cost per output sample goes like N log N / (N - numtaps + 1): small N
+        # wastes most of each FFT on overlap, huge N pays the log and the cache.
+        best = None
+        size = next_fast_len(2*numtaps - 1, True)
+        while True:
+            cost = size * np.log2(size) / (size - numtaps + 1)
+            if best is None or cost < best[0]:
+                best = (cost, size)
+            if size >= max_fft:
+                break
+            size = next_fast_len(size + size // 4, True)
+        return best[1], best[1] - numtaps + 1
+
+    def apply_batch(self, signals, axis=-1):
+        # Filters every row (axis=-1) or column (axis=0) of a 2-D array, block by
+        # block, with one rfft/irfft pair per block for all of them. The output
+        # is the same length as the input and lined up with it (the kernel's
+        # delay is taken off).
+        signals = np.asarray(signals)
+        if signals.ndim != 2:
+            raise ValueError("apply_batch() takes a 2-D array of signals")
+        signals = np.moveaxis(signals, axis, -1)
+        n = signals.shape[-1]
+
+        # Room for the whole convolution plus the tail of the last block's FFT
+        full = np.zeros(signals.shape[:-1] + (n + self.numtaps - 1 + self.fft_size,))
+        for start in range(0, n, self.block_size):
+            full[:, start:start + self.fft_size] += self._filter_block(
+                signals[:, start:start + self.block_size], self.kernel_spectrum
+            )
+
+        return np.moveaxis(full[:, self.delay:self.delay + n], -1, axis)
+
+
+def lowpass(cutoff, sample_rate, numtaps=NUM_TAPS, window="hamming", workers=WORKERS):
+    # FIRFilter passing everything below cutoff
+    return FIRFilter([(cutoff, sample_rate / 2)], sample_rate, numtaps, window, workers)
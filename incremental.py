@@ -0,0 +1,160 @@
+# Keeps track of which partial movie files are reused between renders
+#
+#   INCREMENTAL_SCENES=1 manim -ql main.py ApplyingFT
+#
+# or `python render_all.py --incremental`. Manim names every segment in
+# media/videos/<file>/<quality>/partial_movie_files after a hash of the play()
+# call (camera, animations, mobjects) and reuses the file when the hash comes
+# round again. With INCREMENTAL_SCENES set, scenes built on IncrementalScene
+# record that hash for every play, along with the run time and a fingerprint of
+# the source of every updater on screen, and compare it with the previous render:
+#
+#   ApplyingFT: 112/117 segments reused (96%), 5 re-rendered
+#     #42 mobjects, updater source
+#     ...
+#
+# The report is also written to incremental.json next to the segments, and
+# `python render_all.py --incremental` sums it up across scenes.
+#
+# Manim deletes old segments once a scene has more than max_files_cached (100 by
+# default) of them, which throws away good segments in the longer scenes here,
+# so incremental renders set config.max_files_cached to -1 (no limit). Without
+# INCREMENTAL_SCENES nothing is recorded and the config is left alone. Neither is
+# anything recorded while manim's cache is disabled, as it is for profiled renders.
+#
+
+
+from collections import Counter
+from pathlib import Path
+import hashlib
+import json
+import os
+
+from manim import config, Scene, logger
+
+REPORT = "incremental.json"
+
+
+def _code_fingerprint(function):
+    code = getattr(function, "__code__", None)
+    if code is None:
+        return repr(function)
+    return hashlib.sha256(code.co_code + repr(code.co_consts).encode()).hexdigest()[:16]
+
+
+def miss_reasons(play, previous):
+    # Which part of a play changed since the previous render of the same play
+    if previous is None:
+        return ["new play"]
+    if play["hash"] == previous["hash"]:
+        return ["segment deleted"]
+
+    reasons = [
+        part for part, new, old in zip(
+            ("camera", "animations", "mobjects"), play["hash"].split("_"), previous["hash"].split("_")
+        ) if new != old
+    ]
+    if play["run_time"] != previous["run_time"]:
+        reasons.append("run_time")
+    if play["updaters"] != previous["updaters"]:
+        reasons.append("updater source")
+    return reasons
+
+
+def _incremental_enabled():
+    return os.environ.get("INCREMENTAL_SCENES", "") not in ("", "0")
+
+
+class IncrementalScene(Scene):
+    def setup(self):
+        super().setup()
+        self.incremental = _incremental_enabled()
+        self.plays = []
+        self._segment_dir = None
+        self._existing = set()
+        if not self.incremental:
+            return
+
+        config.max_files_cached = -1
+
+        writer = self.renderer.file_writer
+        if hasattr(writer, "partial_movie_directory"):
+            self._segment_dir = Path(writer.partial_movie_directory)
+            self._existing = {path.stem for path in self._segment_dir.glob("*")}
+
+    def play(self, *args, **kwargs):
+        # With caching disabled (e.g. by ProfiledScene) manim names segments
+        # uncached_NNNNN rather than by hash, so there is nothing to compare
+        if not getattr(self, "incremental", False) or config.disable_caching:
+            return super().play(*args, **kwargs)
+
+        updaters = self.updater_fingerprint()
+        super().play(*args, **kwargs)
+
+        segment = self._last_segment()
+        if segment is not None:
+            self.plays.append({
+                "hash": segment,
+                "run_time": float(getattr(self, "duration", 0)),
+                "updaters": updaters,
+                "reused": segment in self._existing,
+            })
+
+    def updater_fingerprint(self):
+        # Hash of the code of every updater on every mobject in the scene
+        digest = hashlib.sha256()
+        for mob in self.mobjects:
+            for sub in mob.get_family():
+                for updater in sub.get_updaters():
+                    digest.update(_code_fingerprint(updater).encode())
+        return digest.hexdigest()[:16]
+
+    def tear_down(self):
+        super().tear_down()
+        if self.incremental and config.disable_caching:
+            logger.info(f"{type(self).__name__}: caching disabled, no reuse report written")
+        elif self._segment_dir is not None and self.plays:
+            self.write_report()
+
+    def write_report(self):
+        path = self._segment_dir / REPORT
+        previous = json.loads(path.read_text())["plays"] if path.exists() else []
+
+        reasons = Counter()
+        for i, play in enumerate(self.plays):
+            if not play["reused"]:
+                play["reasons"] = miss_reasons(play, previous[i] if i < len(previous) else None)
+                reasons.update(play["reasons"])
+
+        hits = sum(play["reused"] for play in self.plays)
+        summary = {
+            "scene": type(self).__name__,
+            "plays": len(self.plays),
+            "reused": hits,
+            "rendered": len(self.plays) - hits,
+            "hit_rate": hits / len(self.plays),
+            "reasons": dict(reasons),
+        }
+        path.write_text(json.dumps({"summary": summary, "plays": self.plays}, indent=1))
+
+        logger.info(
+            f"{summary['scene']}: {hits}/{len(self.plays)} segments reused "
+            f"({summary['hit_rate']:.0%}), {summary['rendered']} re-rendered"
+        )
+        for i, play in enumerate(self.plays):
+            if not play["reused"]:
+                logger.info(f"  #{i} {', '.join(play['reasons'])}")
+
+    def _last_segment(self):
+        writer = self.renderer.file_writer
+        sections = getattr(writer, "sections", None)
+        files = sections[-1].partial_movie_files if sections else getattr(writer, "partial_movie_files", [])
+        if not files or files[-1] is None:
+            return None
+        return Path(files[-1]).stem
+
+
+def read_reports(media_dir, scene_file, quality_dir):
+    # Returns the summary of the latest render of every scene that has one
+    root = Path(media_dir) / "videos" / Path(scene_file).stem / quality_dir / "partial_movie_files"
+    return [json.loads(path.read_text())["summary"] for path in sorted(root.glob(f"*/{REPORT}"))]
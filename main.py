@@ -12,20 +12,54 @@
 
 from manim import *
 
+from incremental import IncrementalScene
+from profiling import ProfiledScene
+from mobjects import AreaReadout, impulse_arrows, ModulatedProductCurve, plot_signal, SampledGraph, sampled_area, sampled_curve, shared_axes, Spectrogram, TOLERANCE, TrackedSamples
+from signals import adaptive_grid, register
+from stft import STFT
+from sweeps import SweepTable
+from synth import SAMPLE_RATE, synthesize
+from transforms import sample_transform, transform
+
 FOURIER_TRANSFORM = r"F(\omega)=\int_{-\infty}^{\infty}f(t)e^{-i\omega t} \ dt"
 INVERSE_FOURIER   = r"f(t)=\int_{-\infty}^{\infty}F(\nu)e^{i\omega t} d\omega"
 
 EULERS_FORMULA = r"e^{i\theta }=\cos{\theta }+i\sin{\theta }"
 
-C7_CHORD = lambda x: np.sin(262*x) + np.sin(330*x) + np.sin(392*x) + np.sin(494*x)
-FSM7_CHORD = lambda x: np.sin(370*x) + np.sin(466*x) + np.sin(554*x) + np.sin(698*x)
-C_NOISE = lambda x: np.sin(262*x) + np.sin(330*x) + np.sin(392*x) + np.sin(1100*x)
-C = lambda x: np.sin(262*x) + np.sin(330*x) + np.sin(392*x)
+# Registered signals are sampled once per x-grid and shared by every plot of them,
+# see signals.py. Plot them with plot_signal(axes, "C7_CHORD", ...). The chords
+# oscillate far faster than the default grid samples, so they are registered with
+# their fastest frequency and plotted adaptively. Every chord plot reaches
+# TOLERANCE well inside CHORD_BUDGET points (C_NOISE, the fastest, in about 6000).
+CHORD_BUDGET = 8000
+C7_CHORD = register("C7_CHORD", lambda x: np.sin(262*x) + np.sin(330*x) + np.sin(392*x) + np.sin(494*x), max_freq=494)
+FSM7_CHORD = register("FSM7_CHORD", lambda x: np.sin(370*x) + np.sin(466*x) + np.sin(554*x) + np.sin(698*x), max_freq=698)
+C_NOISE = register("C_NOISE", lambda x: np.sin(262*x) + np.sin(330*x) + np.sin(392*x) + np.sin(1100*x), max_freq=1100)
+C = register("C", lambda x: np.sin(262*x) + np.sin(330*x) + np.sin(392*x), max_freq=392)
+
+# The notes of C7_CHORD, plotted one at a time in DecomposingSound. Registered
+# once here, so every render of the scene reuses the same sampled grids.
+NOTES = (
+    ("C4", 262, YELLOW),
+    ("E4", 330, GREEN),
+    ("G4", 392, RED),
+    ("B5", 494, PINK),
+)
+for _name, _freq, _ in NOTES:
+    register(_name, lambda x, freq=_freq: np.sin(freq*x), max_freq=_freq)
+
+# The values of omega each transform sweep stops on, starting where its tracker
+# starts. The same tuple is the scene's precomputed sweep and its set_value
+# targets, so the SweepTable always covers every value the animations reach.
+COS_STOPS = (1, 2*PI, 3*PI, 5*PI, 6*PI) # Both halves of the transform of cos(5t)
+SIN_COS_STOPS = (1, 2*PI, 5*PI)         # Real half of the transform of sin(5t)
+SIN_SIN_STOPS = (1, 2*PI, 5*PI, -5*PI)  # Imaginary half, swinging back to -5pi
+CHORD_STOPS = (1, 2.62, 3.3, 3.92, 11)  # C_NOISE's notes over 100, FilteringSound
 
 
 
 # Develop the graph and integration area under the curve
-class Integral(Scene):
+class Integral(ProfiledScene, IncrementalScene):
     CONFIG = {
         "y_max": 8,
         "y_axis_height": 5
@@ -96,7 +130,7 @@ class Integral(Scene):
         sin_label = ax.get_graph_label(sin_graph, label="\\sin(2x) + \\sin(5x)", x_val=3, direction=UP*4, dot=True)
         self.play(Write(sin_label))
 
-class SineWave(Scene):
+class SineWave(ProfiledScene, IncrementalScene):
     def construct(self):
         self.show_graphs()
     
@@ -119,7 +153,7 @@ class SineWave(Scene):
         )
         axes_labels = axes.get_axis_labels(x_label="t", y_label="f(t)")
 
-        signal = axes.plot(C7_CHORD, color=BLUE)
+        signal = plot_signal(axes, "C7_CHORD", budget=CHORD_BUDGET, color=BLUE)
         signal_label = axes.get_graph_label(signal, "f(t)", x_val=0, direction=UP / 2)
 
         t = ValueTracker(0.01)
@@ -151,7 +185,7 @@ class SineWave(Scene):
 
         self.wait(2)
 
-class Sinewave(Scene):
+class Sinewave(ProfiledScene, IncrementalScene):
     def construct(self):
         self.play_scene()
     
@@ -211,7 +245,7 @@ class Sinewave(Scene):
 
 
 ### Done in high quality
-class HistoryOfIntegration(Scene):
+class HistoryOfIntegration(ProfiledScene, IncrementalScene):
     def construct(self):
         self.wait(3)
         self.my_scene()
@@ -276,7 +310,8 @@ class HistoryOfIntegration(Scene):
 
         eq = MathTex(r"y=x^{2}", color=YELLOW).shift(LEFT*3)
         eqd = MathTex(r"\frac{dy}{dx}=2x", color=RED).shift(RIGHT*3)
-        _sax = NumberPlane(
+        _sax = shared_axes(
+            NumberPlane,
             (0, 2.5, 0.5), (0, 5, 1),
             5, 4,
             background_line_style={
@@ -294,7 +329,8 @@ class HistoryOfIntegration(Scene):
             edge=DOWN,
             direction=DOWN
         )
-        _vax = NumberPlane(
+        _vax = shared_axes(
+            NumberPlane,
             (0, 2.5, 0.5), (0, 5, 1),
             5, 4,
             background_line_style={
@@ -433,29 +469,31 @@ class HistoryOfIntegration(Scene):
 
 
 ### Done in high quality
-class DecomposingSound(Scene):
+class DecomposingSound(ProfiledScene, IncrementalScene):
     def construct(self):
         self.initialise_objects()
         self.play_scene()
     
     def initialise_objects(self):
-        big_axes = Axes(
+        big_axes = shared_axes(
+            Axes,
             x_range=(0, 6, 1), y_range=(-4, 4, 2),
                                 y_length=4,
             tips=False
         )
         big_text = Text("Cmaj7", font_size=42, color=YELLOW)
         big_text.move_to(DOWN*3)
-        big_signal = big_axes.plot(C7_CHORD, color=BLUE)
+        big_signal = plot_signal(big_axes, "C7_CHORD", budget=CHORD_BUDGET, color=BLUE)
 
-        small_axes = Axes(
+        small_axes = shared_axes(
+            Axes,
             x_range=(0, 6, 1), y_range=(-4, 4, 2),
             x_length=10, y_length=1.5,
             tips=False
         )
         small_text = Text("Cmaj7", font_size=24, color=YELLOW)
         small_text.next_to(small_axes, RIGHT*5)
-        small_signal = small_axes.plot(C7_CHORD, color=BLUE)
+        small_signal = plot_signal(small_axes, "C7_CHORD", budget=CHORD_BUDGET, color=BLUE)
 
         self.big_vert_line = Line(start=np.array([-6., -2., 0.]), end=np.array([-6., 2., 0.]), color=GOLD)
         self.small_vert_line = Line(start=np.array([-6., -0.5, 0.]), end=np.array([-6., 0.5, 0.]), color=GOLD)
@@ -463,8 +501,8 @@ class DecomposingSound(Scene):
         ax1_t = Text("f(t)", font_size=42, color=YELLOW)
         ax1_t.move_to(DOWN*3)
         self.ax1 = VGroup(
-            Axes(x_range=(0, 6, 1), y_range=(-4, 4, 2), y_length=4, tips=False),
-            big_axes.plot(FSM7_CHORD, color=GREEN),
+            shared_axes(Axes, x_range=(0, 6, 1), y_range=(-4, 4, 2), y_length=4, tips=False),
+            plot_signal(big_axes, "FSM7_CHORD", budget=CHORD_BUDGET, color=GREEN),
             ax1_t,
             Line(start=np.array([-6., -2., 0.]), end=np.array([-6., 2., 0.]), color=GOLD)
         )
@@ -472,8 +510,8 @@ class DecomposingSound(Scene):
         ax2_t = Text("f(t)", font_size=42, color=MAROON)
         ax2_t.move_to(DOWN*3)
         self.ax2 = VGroup(
-            Axes(x_range=(0, 6, 1), y_range=(-4, 4, 2), y_length=4, tips=False),
-            big_axes.plot(C_NOISE, color=MAROON),
+            shared_axes(Axes, x_range=(0, 6, 1), y_range=(-4, 4, 2), y_length=4, tips=False),
+            plot_signal(big_axes, "C_NOISE", budget=CHORD_BUDGET, color=MAROON),
             ax2_t,
             Line(start=np.array([-6., -2., 0.]), end=np.array([-6., 2., 0.]), color=GOLD)
         )
@@ -488,17 +526,13 @@ class DecomposingSound(Scene):
         self.small_plot = VGroup(small_axes, small_signal, small_text)
         self.small_plot.shift(LEFT)
 
-        self.notes = [
-            ('C4', 262, YELLOW),
-            ('E4', 330, GREEN),
-            ('G4', 392, RED),
-            ('B5', 494, PINK)
-        ]
+        self.notes = list(NOTES)
         offset = 1.5
         for i in range(len(self.notes)):
             t = self.notes[i]
 
-            ax = Axes(
+            ax = shared_axes(
+                Axes,
                 x_range=(0, 6, 1), y_range=(-4, 4, 2),
                 x_length=10, y_length=1,
                 tips=False
@@ -506,14 +540,34 @@ class DecomposingSound(Scene):
             ax.shift(LEFT)
             tx = Text(f"{t[0]} - {t[1]} Hz", color=t[2], font_size=24)
             tx.next_to(ax, RIGHT*4)
-            sg = ax.plot(lambda x: np.sin(t[1]*x), color=t[2])
+            sg = plot_signal(ax, t[0], budget=CHORD_BUDGET, color=t[2])
             ln = Line(start=np.array([-6., -0.5, 0.]), end=np.array([-6., 0.5, 0.]), color=GOLD)
             vg = VGroup(ax, sg, tx, ln)
             vg.shift(UP*(3-offset))
 
             self.notes[i] = vg
             offset += 1.5
-        print(f"\n\n===========\n{self.notes}\n\n================\n\n")
+
+        # The chord built up a note per second, as a spectrogram
+        onsets = np.arange(4)[:, None] * SAMPLE_RATE
+        tones = synthesize([[262], [330], [392], [494]], 1, SAMPLE_RATE, 4)
+        chord = np.where(np.arange(tones.shape[1]) >= onsets, tones, 0).sum(axis=0)
+
+        stft = STFT(SAMPLE_RATE, frame_size=4096, hop=1024, nfft=16384)
+        f_range = (200, 600)
+        spec_axes = Axes(
+            x_range=(0, 4, 1), y_range=(200, 600, 100),
+            x_length=10, y_length=5,
+            tips=False,
+            axis_config={"include_numbers": True}
+        )
+        heatmap = Spectrogram(
+            spec_axes, stft.times(len(chord)), stft.freqs[stft.bins(f_range)],
+            stft.spectrogram(chord, f_range, db=True), value_range=(-60, 0)
+        ).set_z_index(-1)
+        spec_labels = spec_axes.get_axis_labels(Text("t (s)", font_size=24), Text("Hz", font_size=24))
+        spec_text = Text("Cmaj7 over time", font_size=36, color=YELLOW).next_to(spec_axes, UP)
+        self.spectrogram = Group(spec_axes, heatmap, spec_labels, spec_text)
 
     
     def play_scene(self):
@@ -558,6 +612,11 @@ class DecomposingSound(Scene):
         sq.shift(UP*20)
         self.play(ReplacementTransform(self.big_plot, sq), ReplacementTransform(self.small_plot, sq), *[ReplacementTransform(i, sq) for i in self.notes])
 
+        self.play(Create(self.spectrogram[0]), Write(self.spectrogram[2]), run_time=2)
+        self.play(FadeIn(self.spectrogram[1]), FadeIn(self.spectrogram[3]), run_time=2)
+        self.wait(3)
+        self.play(FadeOut(self.spectrogram))
+
         self.play(Create(self.ax1[0]), run_time=2)
         self.play(Create(self.ax1[1]), run_time=4)
         self.play(FadeIn(self.ax1[2]), run_time=0.5)
@@ -578,7 +637,7 @@ class DecomposingSound(Scene):
 
 
 ### Done in high quality
-class IntroducingFT(Scene):
+class IntroducingFT(ProfiledScene, IncrementalScene):
     def construct(self):
         self.wait(5)
         self.initialise_objects()
@@ -600,7 +659,8 @@ class IntroducingFT(Scene):
             color=YELLOW
         )
 
-        ax1 = Axes(
+        ax1 = shared_axes(
+            Axes,
             x_range=(0, 2, 1), y_range=(-2, 2, 2),
             x_length=5, y_length=4,
             tips=False,
@@ -610,7 +670,8 @@ class IntroducingFT(Scene):
         self.vg1 = VGroup(ax1, axs1)
         self.vg1.shift(LEFT*4)
 
-        ax2 = Axes(
+        ax2 = shared_axes(
+            Axes,
             x_range=(0, 3, 1), y_range=(-2, 2, 2),
             x_length=5, y_length=4,
             tips=False,
@@ -650,7 +711,8 @@ class IntroducingFT(Scene):
         self.wait(4)
         self.play(jf_image.animate.shift(LEFT*5))
 
-        ax1 = Axes(
+        ax1 = shared_axes(
+            Axes,
             x_range=(0, 2, 1), y_range=(-2, 2, 2),
             x_length=5, y_length=4,
             tips=False,
@@ -794,7 +856,8 @@ class IntroducingFT(Scene):
         self.wait(5)
 
 
-        sin_ax = Axes(
+        sin_ax = shared_axes(
+            Axes,
             x_range=(0, 2*PI, PI), y_range=(-1, 1, 1),
             x_length=5, y_length=2,
             tips=False,
@@ -802,7 +865,8 @@ class IntroducingFT(Scene):
         sin_gr = sin_ax.plot(lambda x: np.sin(x), color=RED)
         sin_ogr = sin_ax.plot(lambda x: np.sin(-x), color=RED)
 
-        cos_ax = Axes(
+        cos_ax = shared_axes(
+            Axes,
             x_range=(0, 2*PI, PI), y_range=(-1, 1, 1),
             x_length=5, y_length=2,
             tips=False,
@@ -830,7 +894,7 @@ class IntroducingFT(Scene):
 
 
 ### Done in high quality
-class ApplyingFT(Scene):
+class ApplyingFT(ProfiledScene, IncrementalScene):
     def construct(self):
         self.wait(3)
         self.play_scene()
@@ -870,26 +934,23 @@ class ApplyingFT(Scene):
 
         self.wait(5)
 
-        n = ValueTracker(1)
+        n = ValueTracker(COS_STOPS[0])
         dn = r"2\pi"
-        a = "0"
 
         #_nt = always_redraw(
         #    lambda: MathTex(rf"\omega={dn}", color=RED).shift(RIGHT*3).shift(DOWN*3).#set_z_index(3)
         #)
-        _nt = Variable(1, r"\omega", num_decimal_places=2).shift(RIGHT*3).shift(UP*3.5)
+        _nt = Variable(COS_STOPS[0], r"\omega", num_decimal_places=2).shift(RIGHT*3).shift(UP*3.5)
         _nt_pi = always_redraw(
             lambda: MathTex(f"{dn}", color=RED).set_z_index(3).move_to(_nt).shift(RIGHT*0.6)
         )
-        _a = always_redraw(
-            lambda: MathTex(f"Area\\approx{a}", color=RED).set_z_index(3).shift(UP*3.5)
-        )
         _nt.label.set_color(YELLOW)
         _nt.value.set_color(RED)
         nt_tracker = _nt.tracker
         _ntb = BackgroundRectangle(_nt_pi, fill_opacity=1, buff=0.4, z_index=1)
 
-        _ax = NumberPlane(
+        _ax = shared_axes(
+            NumberPlane,
             (-3*PI, 3*PI, 1), (-1.5, 1.5, 0.25),
             16, 8,
             background_line_style={
@@ -900,12 +961,9 @@ class ApplyingFT(Scene):
             MathTex(r"\omega"),
             direction=DOWN
         )
-        ax_eq = always_redraw(
-            lambda: _ax.plot(lambda x: np.cos(5*x)*np.cos((n.get_value()/PI)*x))
-        )
-        ax_ar = always_redraw(
-            lambda: _ax.get_area(ax_eq, color=YELLOW_B)
-        )
+        ax_eq = ModulatedProductCurve(_ax, lambda x: np.cos(5*x), np.cos, n, rate=1/PI, sweep=COS_STOPS)
+        ax_ar = ax_eq.get_area(color=YELLOW_B)
+        _a = AreaReadout(ax_eq.integral, color=RED).set_z_index(3).move_to(UP*3.5)
 
         ax = VGroup(_ax, xlabel)
 
@@ -916,27 +974,25 @@ class ApplyingFT(Scene):
         self.wait(5)
 
         self.play(Uncreate(_nt_pi), run_time=0.0000001)
-        self.play(n.animate.set_value(2*PI), nt_tracker.animate.set_value(2*PI), run_time=5)
+        self.play(n.animate.set_value(COS_STOPS[1]), nt_tracker.animate.set_value(COS_STOPS[1]), run_time=5)
         self.play(FadeIn(_nt_pi, _ntb))
         self.wait(2)
         self.play(FadeOut(_nt_pi, _ntb))
         dn = r"3\pi"
         self.play(Uncreate(_nt_pi), run_time=0.0000001)
-        self.play(n.animate.set_value(3*PI), nt_tracker.animate.set_value(3*PI), run_time=5)
+        self.play(n.animate.set_value(COS_STOPS[2]), nt_tracker.animate.set_value(COS_STOPS[2]), run_time=5)
         self.play(FadeIn(_nt_pi, _ntb))
         self.wait(2)
         self.play(FadeOut(_nt_pi, _ntb))
         dn = r"5\pi"
         self.play(Uncreate(_nt_pi), run_time=0.0000001)
-        self.play(n.animate.set_value(5*PI), nt_tracker.animate.set_value(5*PI), run_time=5)
-        a = r"\infty"
+        self.play(n.animate.set_value(COS_STOPS[3]), nt_tracker.animate.set_value(COS_STOPS[3]), run_time=5)
         self.play(FadeIn(_nt_pi, _ntb))
         self.wait(10)
         self.play(FadeOut(_nt_pi, _ntb))
         dn = r"6\pi"
         self.play(Uncreate(_nt_pi), run_time=0.0000001)
-        a = "0"
-        self.play(n.animate.set_value(6*PI), nt_tracker.animate.set_value(6*PI), run_time=2)
+        self.play(n.animate.set_value(COS_STOPS[4]), nt_tracker.animate.set_value(COS_STOPS[4]), run_time=2)
         self.play(FadeIn(_nt_pi, _ntb))
         
         self.wait(5)
@@ -948,15 +1004,12 @@ class ApplyingFT(Scene):
         fi = VGroup(_fi, fib)
         self.play(fi.animate.shift(UP*3.2).shift(LEFT*4))
 
-        n.set_value(1)
-        nt_tracker.set_value(1.00)
+        n.set_value(COS_STOPS[0])
+        nt_tracker.set_value(COS_STOPS[0])
 
-        ax_eq = always_redraw(
-            lambda: _ax.plot(lambda x: np.cos(5*x)*np.sin((n.get_value()/PI)*x))
-        )
-        ax_ar = always_redraw(
-            lambda: _ax.get_area(ax_eq, color=YELLOW_B)
-        )
+        ax_eq = ModulatedProductCurve(_ax, lambda x: np.cos(5*x), np.sin, n, rate=1/PI, sweep=COS_STOPS)
+        ax_ar = ax_eq.get_area(color=YELLOW_B)
+        _a = AreaReadout(ax_eq.integral, color=RED).set_z_index(3).move_to(UP*3.5)
         
         self.play(Create(ax), Create(_nt), Write(_a), run_time=2)
         self.play(Create(ax_eq), run_time=2)
@@ -964,11 +1017,11 @@ class ApplyingFT(Scene):
 
         self.wait(5)
 
-        self.play(n.animate.set_value(2*PI), nt_tracker.animate.set_value(2*PI), run_time=5)
-        self.play(n.animate.set_value(3*PI), nt_tracker.animate.set_value(3*PI), run_time=5)
-        self.play(n.animate.set_value(5*PI), nt_tracker.animate.set_value(5*PI), run_time=5)
+        self.play(n.animate.set_value(COS_STOPS[1]), nt_tracker.animate.set_value(COS_STOPS[1]), run_time=5)
+        self.play(n.animate.set_value(COS_STOPS[2]), nt_tracker.animate.set_value(COS_STOPS[2]), run_time=5)
+        self.play(n.animate.set_value(COS_STOPS[3]), nt_tracker.animate.set_value(COS_STOPS[3]), run_time=5)
         self.wait(3)
-        self.play(n.animate.set_value(6*PI), nt_tracker.animate.set_value(6*PI), run_time=5)
+        self.play(n.animate.set_value(COS_STOPS[4]), nt_tracker.animate.set_value(COS_STOPS[4]), run_time=5)
 
         self.wait(10)
         self.play(FadeOut(fi, ax_eq, ax_ar, ax, _nt, _a))
@@ -1001,24 +1054,9 @@ class ApplyingFT(Scene):
             tips=False
         )
         xlabel = ax.get_x_axis_label(r"\omega")
-        pline = ax.get_line_from_axis_to_point(
-            0, ax.c2p(2, 4),
-            color=RED,
-            line_func=Arrow,
-            line_config={
-                'buff': 0
-            }
-        )
+        nline, pline = impulse_arrows(ax, transform("cos", 5*PI), 4, x_scale=2/(5*PI), part="real")
         pline_t = MathTex(r"\infty", color=RED).next_to(pline, UP)
         pline_l = MathTex(r"+5\pi").next_to(pline, DOWN*1.3)
-        nline = ax.get_line_from_axis_to_point(
-            0, ax.c2p(-2, 4),
-            color=RED,
-            line_func=Arrow,
-            line_config={
-                'buff': 0
-            }
-        )
         nline_t = pline_t.copy().next_to(nline, UP)
         nline_l = MathTex(r"-5\pi").next_to(nline, DOWN*1.3)
 
@@ -1088,10 +1126,11 @@ class ApplyingFT(Scene):
         self.play(FadeOut(ft, fft[0:2]), fft[2].animate.set_color(YELLOW), fft[2].animate.shift(UP*5).scale(0.7).shift(LEFT))
 
         # ===== =====
-        n = ValueTracker(1)
-        nt_tracker.set_value(1.00)
+        n = ValueTracker(SIN_COS_STOPS[0])
+        nt_tracker.set_value(SIN_COS_STOPS[0])
 
-        _ax = NumberPlane(
+        _ax = shared_axes(
+            NumberPlane,
             (-3*PI, 3*PI, 1), (-1.5, 1.5, 0.25),
             16, 8,
             background_line_style={
@@ -1102,16 +1141,9 @@ class ApplyingFT(Scene):
             MathTex(r"\omega"),
             direction=DOWN
         )
-        ax_eq = always_redraw(
-            lambda: _ax.plot(lambda x: np.sin(5*x)*np.cos((n.get_value()/PI)*x))
-        )
-        ax_ar = always_redraw(
-            lambda: _ax.get_area(ax_eq, color=YELLOW_B)
-        )
-        a = "0"
-        _a = always_redraw(
-            lambda: MathTex(f"Area\\approx{a}", color=RED).set_z_index(3).shift(UP*3.5)
-        )
+        ax_eq = ModulatedProductCurve(_ax, lambda x: np.sin(5*x), np.cos, n, rate=1/PI, sweep=SIN_COS_STOPS)
+        ax_ar = ax_eq.get_area(color=YELLOW_B)
+        _a = AreaReadout(ax_eq.integral, color=RED).set_z_index(3).move_to(UP*3.5)
 
         ax = VGroup(_ax, xlabel)
 
@@ -1119,9 +1151,9 @@ class ApplyingFT(Scene):
         self.play(Create(ax_eq), run_time=2)
         self.play(Write(ax_ar))
 
-        self.play(n.animate.set_value(2*PI), nt_tracker.animate.set_value(2*PI), run_time=2)
+        self.play(n.animate.set_value(SIN_COS_STOPS[1]), nt_tracker.animate.set_value(SIN_COS_STOPS[1]), run_time=2)
         self.wait(2)
-        self.play(n.animate.set_value(5*PI), nt_tracker.animate.set_value(5*PI), run_time=4)
+        self.play(n.animate.set_value(SIN_COS_STOPS[2]), nt_tracker.animate.set_value(SIN_COS_STOPS[2]), run_time=4)
         self.wait(30)
         self.play(FadeOut(ax, _a, _nt, ax_eq, ax_ar, fft[2]))
         # ===== =====
@@ -1130,10 +1162,11 @@ class ApplyingFT(Scene):
         self.play(Write(fti), run_time=2)
         self.play(fti.animate.scale(0.7).shift(UP*2.5).shift(LEFT*3))
         # ===== =====
-        n = ValueTracker(1)
-        nt_tracker.set_value(1.00)
+        n = ValueTracker(SIN_SIN_STOPS[0])
+        nt_tracker.set_value(SIN_SIN_STOPS[0])
 
-        _ax = NumberPlane(
+        _ax = shared_axes(
+            NumberPlane,
             (-3*PI, 3*PI, 1), (-1.5, 1.5, 0.25),
             16, 8,
             background_line_style={
@@ -1144,16 +1177,9 @@ class ApplyingFT(Scene):
             MathTex(r"\omega"),
             direction=DOWN
         )
-        ax_eq = always_redraw(
-            lambda: _ax.plot(lambda x: np.sin(5*x)*np.sin((n.get_value()/PI)*x))
-        )
-        ax_ar = always_redraw(
-            lambda: _ax.get_area(ax_eq, color=YELLOW_B)
-        )
-        a = "0"
-        _a = always_redraw(
-            lambda: MathTex(f"Area\\approx{a}", color=RED).set_z_index(3).shift(UP*3.5)
-        )
+        ax_eq = ModulatedProductCurve(_ax, lambda x: np.sin(5*x), np.sin, n, rate=1/PI, sweep=SIN_SIN_STOPS)
+        ax_ar = ax_eq.get_area(color=YELLOW_B)
+        _a = AreaReadout(ax_eq.integral, color=RED).set_z_index(3).move_to(UP*3.5)
 
         ax = VGroup(_ax, xlabel)
 
@@ -1167,16 +1193,13 @@ class ApplyingFT(Scene):
             color=BLUE
         ).shift(DOWN*2.5).scale(0.7)
 
-        self.play(n.animate.set_value(2*PI), nt_tracker.animate.set_value(2*PI), run_time=2)
+        self.play(n.animate.set_value(SIN_SIN_STOPS[1]), nt_tracker.animate.set_value(SIN_SIN_STOPS[1]), run_time=2)
         self.wait(2)
-        self.play(n.animate.set_value(5*PI), nt_tracker.animate.set_value(5*PI), run_time=4)
-        a = r"\infty"
+        self.play(n.animate.set_value(SIN_SIN_STOPS[2]), nt_tracker.animate.set_value(SIN_SIN_STOPS[2]), run_time=4)
         self.play(Write(mft), run_time=2)
         self.wait(5)
         self.play(FadeOut(mft))
-        a = "0"
-        self.play(n.animate.set_value(-5*PI), nt_tracker.animate.set_value(-5*PI), run_time=6)
-        a = r"-\infty"
+        self.play(n.animate.set_value(SIN_SIN_STOPS[3]), nt_tracker.animate.set_value(SIN_SIN_STOPS[3]), run_time=6)
         nmft = MathTex(
             r"F_{i}(\omega)&=\int_{-\infty}^{\infty}\sin{(5\pi t)}\sin{(-5\pi t)} \ dt \\",
             r"&=-\int_{-\infty}^{\infty}\sin^{2}{(5\pi t)} \ dt",
@@ -1198,24 +1221,9 @@ class ApplyingFT(Scene):
             tips=False
         )
         xlabel = ax.get_x_axis_label(r"\omega")
-        pline = ax.get_line_from_axis_to_point(
-            0, ax.c2p(2, -4),
-            color=RED,
-            line_func=Arrow,
-            line_config={
-                'buff': 0
-            }
-        )
+        nline, pline = impulse_arrows(ax, transform("sin", 5*PI), 4, x_scale=2/(5*PI), part="imag")
         pline_t = MathTex(r"-\infty", color=RED).next_to(pline, DOWN)
         pline_l = MathTex(r"+5\pi").next_to(pline, UP*1.3)
-        nline = ax.get_line_from_axis_to_point(
-            0, ax.c2p(-2, 4),
-            color=RED,
-            line_func=Arrow,
-            line_config={
-                'buff': 0
-            }
-        )
         nline_t = MathTex(r"\infty", color=RED).next_to(nline, UP)
         nline_l = MathTex(r"-5\pi").next_to(nline, DOWN*1.3)
 
@@ -1233,7 +1241,7 @@ class ApplyingFT(Scene):
 
 
 ### Done in high quality
-class IntegrationByParts(Scene):
+class IntegrationByParts(ProfiledScene, IncrementalScene):
     def construct(self):
         self.wait(3)
         self.play_scene()
@@ -1274,12 +1282,7 @@ class IntegrationByParts(Scene):
         labelp1 = Text("1").next_to(ax.c2p(1, 0), DOWN, buff=0.2)
         labeln1 = Text("-1").next_to(ax.c2p(-1, 0), DOWN, buff=0.2)
         label0 = Text("0").next_to(ax.c2p(0, 0), DL, buff=0.2)
-        def tri_func(x):
-            if -1 <= x and x < 0: return 1+x
-            if 0 <= x and x <= 1: return 1-x
-            # otherwise
-            return 0
-        ax_eq = ax.plot(lambda x: tri_func(x), color=BLUE)
+        ax_eq = plot_signal(ax, "triangle", color=BLUE)
 
         self.play(Create(ax), Create(label1), Create(labelp1), Create(labeln1), Create(label0))
         self.play(Create(ax_eq), run_time=2)
@@ -1506,7 +1509,9 @@ class IntegrationByParts(Scene):
         label1 = Text("1").next_to(ax.c2p(0, 1), LEFT, buff=0.2)
         labelp1 = MathTex(r"2\pi").next_to(ax.c2p(2*PI, 0), DOWN, buff=0.2)
         labeln1 = MathTex(r"-2\pi").next_to(ax.c2p(-2*PI, 0), DOWN, buff=0.2)
-        sinc_eq = ax.plot(lambda x: np.sinc(x/(2*PI))**2, color=BLUE)
+        # Sampled in one vectorised call (and cached) instead of per point by ax.plot()
+        w, Fw = sample_transform("triangle", (-12*PI, 12*PI), 1201)
+        sinc_eq = SampledGraph(ax, w, Fw.real, transform("triangle").real, color=BLUE)
 
         self.play(Create(ax), run_time=2)
         self.play(Write(sinc_eq), Write(xlabel), Write(label1), Write(labelp1), Write(labeln1), run_time=2)
@@ -1523,7 +1528,7 @@ class IntegrationByParts(Scene):
 
 
 ### Done in high quality
-class UnitImpulse(Scene):
+class UnitImpulse(ProfiledScene, IncrementalScene):
     def construct(self):
         self.wait(3)
         self.play_scene()
@@ -1711,24 +1716,9 @@ class UnitImpulse(Scene):
         )
         xlabel = ax.get_x_axis_label(r"\omega")
         ylabel_pi = MathTex(r"\pi").next_to(ax.c2p(0, 3), LEFT)
-        pline = ax.get_line_from_axis_to_point(
-            0, ax.c2p(2, 3),
-            color=RED,
-            line_func=Arrow,
-            line_config={
-                'buff': 0
-            }
-        )
+        nline, pline = impulse_arrows(ax, transform("cos", 5*PI), 3, x_scale=2/(5*PI), part="real")
         pline_t = MathTex(r"\infty", color=RED).next_to(pline, UP)
         pline_l = MathTex(r"5\pi").next_to(pline, DOWN*1.3)
-        nline = ax.get_line_from_axis_to_point(
-            0, ax.c2p(-2, 3),
-            color=RED,
-            line_func=Arrow,
-            line_config={
-                'buff': 0
-            }
-        )
         nline_t = pline_t.copy().next_to(nline, UP)
         nline_l = MathTex(r"-5\pi").next_to(nline, DOWN*1.3)
 
@@ -1760,24 +1750,9 @@ class UnitImpulse(Scene):
             }
         )
         xlabel = ax.get_x_axis_label(r"\omega")
-        pline = ax.get_line_from_axis_to_point(
-            0, ax.c2p(2, -3),
-            color=RED,
-            line_func=Arrow,
-            line_config={
-                'buff': 0
-            }
-        )
+        nline, pline = impulse_arrows(ax, transform("sin", 5*PI), 3, x_scale=2/(5*PI), part="imag")
         pline_t = MathTex(r"-\infty", color=RED).next_to(pline, DOWN)
         pline_l = MathTex(r"5\pi").next_to(pline, UP*1.3)
-        nline = ax.get_line_from_axis_to_point(
-            0, ax.c2p(-2, 3),
-            color=RED,
-            line_func=Arrow,
-            line_config={
-                'buff': 0
-            }
-        )
         nline_t = MathTex(r"\infty", color=RED).next_to(nline, UP)
         nline_l = MathTex(r"-5\pi").next_to(nline, DOWN*1.3)
 
@@ -1798,7 +1773,7 @@ class UnitImpulse(Scene):
 
 
 ### Done in high quality
-class FilteringSound(Scene):
+class FilteringSound(ProfiledScene, IncrementalScene):
     def construct(self):
         self.wait(3)
         self.play_scene()
@@ -1810,7 +1785,8 @@ class FilteringSound(Scene):
 
         self.wait(5)
         # ===== =====   ===== =====
-        big_axes = Axes(
+        big_axes = shared_axes(
+            Axes,
             x_range=(0, 6, 1), y_range=(-4, 4, 2),
                                 y_length=4,
             tips=False
@@ -1818,8 +1794,8 @@ class FilteringSound(Scene):
         ax2_t = Text("f(t)", font_size=42, color=MAROON)
         ax2_t.move_to(DOWN*3)
         self.ax2 = VGroup(
-            Axes(x_range=(0, 6, 1), y_range=(-4, 4, 2), y_length=4, tips=False),
-            big_axes.plot(C_NOISE, color=MAROON),
+            shared_axes(Axes, x_range=(0, 6, 1), y_range=(-4, 4, 2), y_length=4, tips=False),
+            plot_signal(big_axes, "C_NOISE", budget=CHORD_BUDGET, color=MAROON),
             ax2_t,
             Line(start=np.array([-6., -2., 0.]), end=np.array([-6., 2., 0.]), color=GOLD)
         )
@@ -1842,36 +1818,14 @@ class FilteringSound(Scene):
         self.play(Create(_ft_sr))
         ft = VGroup(_ft, _ft_sr)
 
-        n = ValueTracker(1)
-        a = "0"
-
-
-
-        def precise_plot(x_min=-10, x_max=10, samples=1000):
-            x_val = np.linspace(x_min, x_max, samples)
-            y_val = (np.sin(2.62*x_val) + np.sin(3.30*x_val) + np.sin(3.92*x_val) + np.sin(11*x_val)) * np.sin(n.get_value()*x_val)
-
-            ax_eq = VMobject()
-            points = [_ax.c2p(x, y) for x, y in zip(x_val, y_val)]
-            ax_eq.set_points_as_corners(points)
-
-            return ax_eq
-        def precise_area(x_min=-10, x_max=10, samples=1000):
-            x_val = np.linspace(x_min, x_max, samples)
-            y_val = (np.sin(2.62*x_val) + np.sin(3.30*x_val) + np.sin(3.92*x_val) + np.sin(11*x_val)) * np.sin(n.get_value()*x_val)
-
-            points = [_ax.c2p(x, y) for x, y in zip(x_val, y_val)]
-            vertices = [_ax.c2p(x_min, 0)] + points + [_ax.c2p(x_max, 0)]
-            ax_ar = Polygon(*vertices, color=YELLOW_B, fill_opacity=0.5, stroke_width=0)
-
-            return ax_ar
+        n = ValueTracker(CHORD_STOPS[0])
 
 
 
         #_nt = always_redraw(
         #    lambda: MathTex(rf"\omega={dn}", color=RED).shift(RIGHT*3).shift(DOWN*3).#set_z_index(3)
         #)
-        _nt = Variable(1, r"\omega", num_decimal_places=2).shift(RIGHT*3).shift(UP*3.5)
+        _nt = Variable(CHORD_STOPS[0], r"\omega", num_decimal_places=2).shift(RIGHT*3).shift(UP*3.5)
         _nt.label.set_color(YELLOW)
         _nt.value.set_color(RED)
         nt_tracker = _nt.tracker
@@ -1887,17 +1841,29 @@ class FilteringSound(Scene):
             MathTex(r"\omega"),
             direction=DOWN
         )
+
+        # The signal is fixed, only the sin(n*x) factor changes with the tracker, and
+        # the plot and the area below share one evaluated array per frame. The x-grid
+        # is the adaptive one that keeps the product within TOLERANCE on screen for
+        # omega across the sweep, rather than a fixed 2000 samples.
+        chord = lambda x: sum(np.sin(w*x) for w in CHORD_STOPS[1:])
+        omegas = np.linspace(CHORD_STOPS[0], CHORD_STOPS[-1], 101)
+        x_val, _ = adaptive_grid(
+            lambda x: chord(x) * np.sin(np.multiply.outer(omegas, x)), (-10, 10),
+            budget=2000, tolerance=TOLERANCE / _ax.y_axis.get_unit_size()
+        )
+        signal = chord(x_val)
+        sweep = SweepTable.cached(lambda w: signal * np.sin(w*x_val), x_val, CHORD_STOPS)
+        product = TrackedSamples(n, sweep.samples)
+
         ax_eq = always_redraw(
-            lambda: precise_plot(-10, 10, 2000)
+            lambda: sampled_curve(_ax, x_val, product.get())
         )
         ax_ar = always_redraw(
-            lambda: precise_area(-10, 10, 2000)
+            lambda: sampled_area(_ax, x_val, product.get(), color=YELLOW_B, fill_opacity=0.5, stroke_width=0)
         )
 
-        _a = always_redraw(
-            lambda: MathTex(f"Area\\approx{a}", color=RED).set_z_index(3).shift(UP*3.5)
-        )
-        print(a)
+        _a = AreaReadout(lambda: sweep.area(n.get_value()), color=RED).set_z_index(3).move_to(UP*3.5)
 
         ax = VGroup(_ax, xlabel)
 
@@ -1907,24 +1873,13 @@ class FilteringSound(Scene):
 
         self.wait(5)
 
-        self.play(n.animate.set_value(2.62), nt_tracker.animate.set_value(262), run_time=4)
-        a = r"\infty"
-        self.update_mobjects(_a)
+        self.play(n.animate.set_value(CHORD_STOPS[1]), nt_tracker.animate.set_value(100*CHORD_STOPS[1]), run_time=4)
         self.wait(3)
-        a = "0"
-        self.play(n.animate.set_value(3.3), nt_tracker.animate.set_value(330), run_time=4)
-        a = r"\infty"
-        self.update_mobjects(_a)
+        self.play(n.animate.set_value(CHORD_STOPS[2]), nt_tracker.animate.set_value(100*CHORD_STOPS[2]), run_time=4)
         self.wait(3)
-        a = "0"
-        self.play(n.animate.set_value(3.92), nt_tracker.animate.set_value(392), run_time=4)
-        a = r"\infty"
-        self.update_mobjects(_a)
+        self.play(n.animate.set_value(CHORD_STOPS[3]), nt_tracker.animate.set_value(100*CHORD_STOPS[3]), run_time=4)
         self.wait(5)
-        a = "0"
-        self.play(n.animate.set_value(11), nt_tracker.animate.set_value(1100), run_time=5)
-        a = r"\infty"
-        self.update_mobjects(_a)
+        self.play(n.animate.set_value(CHORD_STOPS[4]), nt_tracker.animate.set_value(100*CHORD_STOPS[4]), run_time=5)
         
         self.wait(5)
         self.play(FadeOut(ax, _a, _nt, ft, ax_eq, ax_ar))
@@ -1977,7 +1932,8 @@ class FilteringSound(Scene):
         self.wait()
         self.play(FadeOut(ax, xlabel, pline_t, pts[0:3], ft))
 
-        big_axes = Axes(
+        big_axes = shared_axes(
+            Axes,
             x_range=(0, 6, 1), y_range=(-4, 4, 2),
                                 y_length=4,
             tips=False
@@ -1985,8 +1941,8 @@ class FilteringSound(Scene):
         ax2_t = Text("f(t)", font_size=42, color=MAROON)
         ax2_t.move_to(DOWN*3)
         self.ax2 = VGroup(
-            Axes(x_range=(0, 6, 1), y_range=(-4, 4, 2), y_length=4, tips=False),
-            big_axes.plot(C, color=MAROON),
+            shared_axes(Axes, x_range=(0, 6, 1), y_range=(-4, 4, 2), y_length=4, tips=False),
+            plot_signal(big_axes, "C", budget=CHORD_BUDGET, color=MAROON),
             ax2_t,
             Line(start=np.array([-6., -2., 0.]), end=np.array([-6., 2., 0.]), color=GOLD)
         )
@@ -2002,7 +1958,7 @@ class FilteringSound(Scene):
 
 
 ### Done in high quality
-class Conclusion(Scene):
+class Conclusion(ProfiledScene, IncrementalScene):
     def construct(self):
         self.wait(3)
         self.play_scene()
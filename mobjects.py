@@ -0,0 +1,264 @@
+# Mobjects and helpers shared by the scenes in main.py
+#
+
+
+from collections.abc import Hashable
+
+from manim import *
+from scipy.integrate import trapezoid
+
+from signals import SIGNALS
+from sweeps import SweepTable
+
+POINTS_PER_TICK = 10 # Same sampling density as Axes.plot()
+TOLERANCE = 0.02 # Scene units an adaptively sampled plot may be off by, half a default stroke
+
+
+def coords_to_points(axes, x, y):
+    # Vectorised axes.c2p() for linear axes: maps whole x/y arrays to scene points
+    # with one affine transform instead of one c2p() call per sample.
+    origin = np.asarray(axes.c2p(0, 0), dtype=float)
+    x_unit = np.asarray(axes.c2p(1, 0), dtype=float) - origin
+    y_unit = np.asarray(axes.c2p(0, 1), dtype=float) - origin
+    return origin + np.multiply.outer(x, x_unit) + np.multiply.outer(y, y_unit)
+
+
+def _freeze(value):
+    # Hashable stand-in for constructor arguments (dicts, lists, arrays, ...)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value if isinstance(value, Hashable) else repr(value)
+
+
+_AXES = {}
+
+
+def shared_axes(cls, *args, **kwargs):
+    # cls(*args, **kwargs), e.g. Axes or NumberPlane, built once per distinct set
+    # of arguments and handed out as copies after that. Copying the ticks, lines
+    # and number labels is much cheaper than laying them out and typesetting the
+    # labels again, which is most of what building a set of axes costs. Each copy
+    # is independent, so shift() or add_coordinates() on one leaves the rest alone.
+    key = (cls, _freeze(args), _freeze(kwargs))
+    if key not in _AXES:
+        _AXES[key] = cls(*args, **kwargs)
+    return _AXES[key].copy()
+
+
+class SampledGraph(ParametricFunction):
+    # A graph built from precomputed samples. It behaves like the result of
+    # axes.plot() (get_area, get_graph_label, ... all work), but its points come
+    # straight from the x/y arrays instead of calling the function per sample.
+    def __init__(self, axes, x, y, function, **kwargs):
+        self.sample_points = coords_to_points(axes, x, y)
+        super().__init__(
+            lambda t: axes.c2p(t, function(t)),
+            t_range=(x[0], x[-1], x[1] - x[0] if len(x) > 1 else 1),
+            **kwargs
+        )
+        self.underlying_function = function
+
+    def generate_points(self):
+        self.start_new_path(self.sample_points[0])
+        self.add_points_as_corners(self.sample_points[1:])
+        if self.use_smoothing:
+            self.make_smooth()
+        return self
+
+    init_points = generate_points
+
+
+def plot_signal(axes, name, x_range=None, budget=None, tolerance=TOLERANCE, registry=SIGNALS, **kwargs):
+    # Drop-in for axes.plot(function) with a registered signal name. With a
+    # budget the points are placed adaptively (signals.adaptive_grid) until the
+    # drawn curve is within tolerance scene units of the signal, from a start
+    # grid set by the max_freq it was registered with; otherwise the uniform
+    # Axes.plot() grid is used.
+    x_min, x_max, x_step = axes.x_range[:3]
+    if x_range is not None:
+        x_min, x_max = x_range[:2]
+
+    if budget is not None:
+        y_unit = np.linalg.norm(coords_to_points(axes, 0, 1) - coords_to_points(axes, 0, 0))
+        smooth = kwargs.get("use_smoothing", True)
+        x, y = registry.sample_adaptive(name, (x_min, x_max), budget, tolerance / y_unit, smooth)
+    else:
+        resolution = x_range[2] if x_range is not None and len(x_range) > 2 else x_step / POINTS_PER_TICK
+        x, y = registry.sample(name, (x_min, x_max), resolution)
+    return SampledGraph(axes, x, y, registry[name], **kwargs)
+
+
+def sampled_curve(axes, x, y, **kwargs):
+    # Polyline through the samples, with every point mapped in one NumPy call
+    return VMobject(**kwargs).set_points_as_corners(coords_to_points(axes, x, y))
+
+
+def sampled_area(axes, x, y, **kwargs):
+    # Filled region between the samples and the x-axis, the array version of
+    # Polygon(axes.c2p(x_min, 0), *curve_points, axes.c2p(x_max, 0))
+    xs = np.concatenate(([x[0]], x, [x[-1]]))
+    ys = np.concatenate(([0], y, [0]))
+    return Polygon(*coords_to_points(axes, xs, ys), **kwargs)
+
+
+def impulse_arrows(axes, transform, height, x_scale=1, part="real", color=RED, **kwargs):
+    # One arrow per Dirac impulse of a transforms.Transform, from the axis at
+    # w * x_scale to `height` (the impulses are infinitely tall, so the height is
+    # only for show), pointing up or down with the sign of the chosen part of
+    # its weight. Impulses with nothing in that part are left out.
+    arrows = VGroup()
+    for w, weight in transform.impulses:
+        value = weight.real if part == "real" else weight.imag
+        if value != 0:
+            arrows.add(axes.get_line_from_axis_to_point(
+                0, axes.c2p(w * x_scale, np.sign(value) * height),
+                color=color, line_func=Arrow, line_config={"buff": 0, **kwargs}
+            ))
+    return arrows
+
+
+class TrackedSamples:
+    # Evaluates function(tracker value) at most once per value, so several
+    # always_redraw() updaters drawing the same data in one frame share one array.
+    def __init__(self, tracker, function):
+        self.tracker = tracker
+        self.function = function
+        self._value = None
+        self._samples = None
+
+    def get(self):
+        value = self.tracker.get_value()
+        if self._samples is None or value != self._value:
+            self._value = value
+            self._samples = self.function(value)
+        return self._samples
+
+
+class ModulatedProductCurve(VMobject):
+    # Graph of base(x) * modulation(rate * tracker_value * x) on fixed axes, e.g.
+    #
+    #   ModulatedProductCurve(_ax, lambda x: np.cos(5*x), np.cos, n, rate=1/PI)
+    #
+    # draws cos(5x)cos((n/PI)x). The x-grid, its scene positions and base(x) are
+    # worked out once; when the tracker moves only the modulating factor is
+    # recomputed and the existing points are overwritten, rather than building a
+    # new ParametricFunction every frame like always_redraw(lambda: _ax.plot(...)).
+    # Given the tracker values the scene stops at as sweep, the whole sweep is
+    # precomputed into a SweepTable and frames only look rows up in it.
+    def __init__(self, axes, base, modulation, tracker, rate=1, x_range=None, sweep=None, **kwargs):
+        x_min, x_max, x_step = axes.x_range[:3]
+        if x_range is not None:
+            x_min, x_max = x_range[:2]
+        self.x = np.append(np.arange(x_min, x_max, x_step / POINTS_PER_TICK), x_max)
+
+        # The axes are assumed not to move, so their transform is applied once
+        origin = coords_to_points(axes, 0, 0)
+        self.x_points = coords_to_points(axes, self.x, 0)
+        self.y_unit = coords_to_points(axes, 0, 1) - origin
+        self.baseline = coords_to_points(axes, np.array([x_min, x_max]), 0)
+
+        x = self.x
+        base_values = base(x)
+        integrand = lambda value: base_values * modulation(rate*value*x)
+        self.table = SweepTable.cached(integrand, x, sweep) if sweep is not None else None
+        self.samples = TrackedSamples(tracker, self.table.samples if self.table is not None else integrand)
+        self._drawn = None
+
+        super().__init__(**kwargs)
+        self.add_updater(lambda m: m.update_points())
+
+    def get_sample_points(self):
+        return self.x_points + np.multiply.outer(self.samples.get(), self.y_unit)
+
+    def integral(self):
+        # Area under the curve for the current tracker value
+        if self.table is not None:
+            return self.table.area(self.samples.tracker.get_value())
+        return trapezoid(self.samples.get(), self.x)
+
+    def update_points(self):
+        samples = self.samples.get()
+        if samples is not self._drawn:
+            self._drawn = samples
+            self.clear_points()
+            self.start_new_path(self.x_points[0] + samples[0]*self.y_unit)
+            self.add_points_as_corners(self.get_sample_points()[1:])
+            self.make_smooth()
+        return self
+
+    def generate_points(self):
+        self._drawn = None
+        return self.update_points()
+
+    init_points = generate_points
+
+    def get_area(self, color=(BLUE, GREEN), opacity=0.3, **kwargs):
+        # Same look as axes.get_area(graph), but the fill is reshaped in place
+        # from this curve's samples each frame instead of being rebuilt.
+        def vertices():
+            return np.vstack((self.baseline[:1], self.get_sample_points(), self.baseline[1:]))
+
+        def update_area(area):
+            points = vertices()
+            area.set_points_as_corners(np.vstack((points, points[:1])))
+
+        area = Polygon(*vertices(), **kwargs).set_opacity(opacity).set_color(color)
+        area.add_updater(update_area)
+        return area
+
+
+class AreaReadout(VGroup):
+    # "Area ~ <number>" label that follows the current curve. get_area() supplies
+    # the area for the tracker's current value (ModulatedProductCurve.integral,
+    # SweepTable.area), shown in a DecimalNumber, so the label is rendered once
+    # and only the digits change as the tracker moves.
+    def __init__(self, get_area, label=r"Area\approx", num_decimal_places=2, **kwargs):
+        self.get_area = get_area
+        self.label = MathTex(label, **kwargs)
+        self.value = DecimalNumber(self.get_area(), num_decimal_places=num_decimal_places, **kwargs)
+        self.value.next_to(self.label, RIGHT)
+
+        super().__init__(self.label, self.value)
+        self.add_updater(lambda m: m.update_value())
+
+    def update_value(self):
+        area = self.get_area()
+        if area != self.value.get_value():
+            self.value.set_value(area)
+            # set_value() rebuilds the digits at z_index 0, under the area fill
+            self.value.set_z_index(self.z_index)
+        return self
+
+
+class Spectrogram(ImageMobject):
+    # Heatmap of a (frames, bins) matrix such as STFT.spectrogram() output, laid
+    # over axes with time along x and frequency along y. The matrix becomes the
+    # pixels of one image (a pixel per frame and bin) instead of a rectangle per
+    # cell, and values are coloured along colors from low to high.
+    def __init__(self, axes, times, freqs, values, colors=(BLACK, BLUE, YELLOW), value_range=None, **kwargs):
+        low, high = value_range if value_range is not None else (values.min(), values.max())
+        levels = np.clip((values - low) / ((high - low) or 1), 0, 1)
+
+        palette = np.array([color_to_rgb(color) for color in colors])
+        position = levels * (len(palette) - 1)
+        index = np.minimum(position.astype(int), len(palette) - 2)
+        alpha = (position - index)[..., None]
+        rgb = (1 - alpha)*palette[index] + alpha*palette[index + 1]
+
+        # Rows of the image run top to bottom, so the highest frequency goes first
+        pixels = np.round(255 * rgb.transpose(1, 0, 2)[::-1]).astype(np.uint8)
+        super().__init__(pixels, **kwargs)
+
+        # Each cell is centred on its time/frequency, so the image reaches half a
+        # cell past the first and last ones.
+        dt = (times[-1] - times[0]) / max(len(times) - 1, 1)
+        df = (freqs[-1] - freqs[0]) / max(len(freqs) - 1, 1)
+        corner = coords_to_points(axes, times[0] - dt/2, freqs[0] - df/2)
+        opposite = coords_to_points(axes, times[-1] + dt/2, freqs[-1] + df/2)
+        self.stretch_to_fit_width(opposite[0] - corner[0])
+        self.stretch_to_fit_height(opposite[1] - corner[1])
+        self.move_to((corner + opposite) / 2)
@@ -0,0 +1,85 @@
+# Peak normalisation and conversion to integer PCM
+#
+# Replaces `np.int16(x/x.max() * 32767)` in applying_fft.py, which builds three
+# full-size temporaries (x/max, *32767 and the int16 copy) and scales by the
+# largest positive sample, so a signal whose biggest swing is negative wraps
+# around on conversion. Here the peak is the largest absolute value, and the
+# scale, round and clip happen a chunk at a time in one reused float buffer
+# before landing in the output array:
+#
+#   normalised = to_pcm(signal)                       # new int16 array
+#   to_pcm(signal, out=create_wav(path, rate, n)[:, 0]) # straight into a mapped file
+#
+# For signals that arrive in blocks, Normalizer keeps a running peak. Either
+# feed every block to update() first and convert on a second pass (same result
+# as to_pcm), or update and convert each block as it comes, in which case the
+# gain can only go down as louder blocks arrive and nothing ever clips.
+#
+
+
+import numpy as np
+
+CHUNK_SIZE = 65536 # Samples scaled per pass
+
+
+def abs_peak(signal, chunk_size=CHUNK_SIZE):
+    # Largest |sample|, found from max() and min() so no |signal| array is built
+    signal = np.asarray(signal).reshape(-1)
+    peak = 0.0
+    for start in range(0, len(signal), chunk_size):
+        chunk = signal[start:start + chunk_size]
+        peak = max(peak, float(chunk.max()), -float(chunk.min()))
+    return peak
+
+
+def _full_scale(dtype):
+    info = np.iinfo(dtype)
+    return info.min, info.max
+
+
+def to_pcm(signal, out=None, peak=None, dtype=np.int16, level=1.0, chunk_size=CHUNK_SIZE):
+    # Scales signal so its peak sits at level * full scale and writes it to out
+    # (a new dtype array if None) as rounded, clipped integers. peak defaults to
+    # abs_peak(signal); pass one to convert several pieces with the same gain.
+    signal = np.asarray(signal)
+    if out is None:
+        out = np.empty(signal.shape, dtype)
+    elif out.shape != signal.shape:
+        raise ValueError(f"out has shape {out.shape}, signal has {signal.shape}")
+
+    if peak is None:
+        peak = abs_peak(signal, chunk_size)
+    low, high = _full_scale(out.dtype)
+    scale = level * high / peak if peak > 0 else 0.0
+
+    # Chunks are whole rows, so out can be any view, e.g. one channel of a file
+    rows = max(1, chunk_size // max(1, int(np.prod(signal.shape[1:]))))
+    scratch = np.empty((min(rows, len(signal)),) + signal.shape[1:])
+    for start in range(0, len(signal), rows):
+        piece = signal[start:start + rows]
+        chunk = scratch[:len(piece)]
+        np.multiply(piece, scale, out=chunk)
+        np.rint(chunk, out=chunk)
+        np.clip(chunk, low, high, out=chunk)
+        out[start:start + len(piece)] = chunk
+    return out
+
+
+class Normalizer:
+    def __init__(self, dtype=np.int16, level=1.0, chunk_size=CHUNK_SIZE):
+        self.dtype = np.dtype(dtype)
+        self.level = level
+        self.chunk_size = chunk_size
+        self.peak = 0.0
+
+    def update(self, block):
+        self.peak = max(self.peak, abs_peak(block, self.chunk_size))
+        return self
+
+    def convert(self, block, out=None):
+        # block at the gain for the peak seen so far
+        return to_pcm(block, out, self.peak, self.dtype, self.level, self.chunk_size)
+
+    def process(self, block, out=None):
+        # Running-peak mode: one pass, nothing held back
+        return self.update(block).convert(block, out)
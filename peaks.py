@@ -0,0 +1,101 @@
+# Peak picking and chord identification on magnitude spectra
+#
+#   freqs, heights = find_peaks(np.abs(rfft(frames)), bin_width=SAMPLE_RATE/n)
+#   names, scores = identify_chords(freqs)    # "C7" for 262/330/392/494 Hz
+#
+# Everything works on the last axis of an array of any shape, so a whole
+# spectrogram (frames, bins) is handled in a few NumPy calls rather than one
+# Python loop per frame. A peak is a bin above the threshold that is the largest
+# within min_spacing bins either side. Its position is refined to a fraction of
+# a bin by fitting a parabola through it and its two neighbours (on the log
+# magnitude by default), which is what gets 2.62 Hz out of bins 0.033 Hz wide.
+# Frames with fewer peaks than max_peaks are padded with NaN.
+#
+
+
+from scipy.ndimage import maximum_filter1d
+import numpy as np
+
+THRESHOLD = 0.05 # Fraction of the largest bin in each spectrum
+MAX_PEAKS = 8
+TOLERANCE = 30 # Cents either side of a chord note that still count as that note
+MIN_NOTES = 3 # Matched notes needed to call it a chord at all
+
+CHORDS = {
+    "C": (262, 330, 392),
+    "C7": (262, 330, 392, 494),
+    "F#maj7": (370, 466, 554, 698),
+}
+
+
+def interpolate_peaks(spectra, bins, log=True):
+    # Returns (positions in bins, heights) of the parabola through bins - 1,
+    # bins, bins + 1 of each spectrum. bins must not be the first or last bin.
+    left = np.take_along_axis(spectra, bins - 1, axis=-1)
+    centre = np.take_along_axis(spectra, bins, axis=-1)
+    right = np.take_along_axis(spectra, bins + 1, axis=-1)
+    if log:
+        tiny = np.finfo(np.float64).tiny
+        left, centre, right = (np.log(np.maximum(v, tiny)) for v in (left, centre, right))
+
+    curvature = left - 2*centre + right
+    with np.errstate(divide="ignore", invalid="ignore"):
+        offset = np.where(curvature < 0, 0.5*(left - right) / curvature, 0.0)
+    heights = centre - 0.25*(left - right)*offset
+    return bins + offset, np.exp(heights) if log else heights
+
+
+def find_peaks(spectra, threshold=THRESHOLD, min_spacing=1, max_peaks=MAX_PEAKS, relative=True,
+               bin_width=1.0, log=True):
+    # Returns (positions, heights), each of shape spectra.shape[:-1] + (max_peaks,),
+    # with the peaks of each spectrum in order of position. Positions are in
+    # bins times bin_width, so pass sample_rate/n to get Hertz.
+    spectra = np.asarray(spectra, dtype=np.float64)
+    n_bins = spectra.shape[-1]
+    if n_bins < 3:
+        raise ValueError(f"need at least 3 bins per spectrum, got {n_bins}")
+
+    if relative:
+        threshold = threshold * spectra.max(axis=-1, keepdims=True)
+    window_max = maximum_filter1d(spectra, 2*int(min_spacing) + 1, axis=-1, mode="constant", cval=-np.inf)
+
+    # Strictly above the bin to the left, so a flat top counts once
+    is_peak = (spectra == window_max) & (spectra >= threshold)
+    is_peak[..., 1:] &= spectra[..., 1:] > spectra[..., :-1]
+    is_peak[..., [0, -1]] = False
+
+    score = np.where(is_peak, spectra, -np.inf)
+    k = min(max_peaks, n_bins)
+    bins = np.argpartition(-score, k - 1, axis=-1)[..., :k] if k < n_bins else np.argsort(-score, axis=-1)
+    found = np.isfinite(np.take_along_axis(score, bins, axis=-1))
+    bins = np.where(found, bins, n_bins) # Missing peaks sort to the end
+    order = np.argsort(bins, axis=-1)
+    bins, found = np.take_along_axis(bins, order, axis=-1), np.take_along_axis(found, order, axis=-1)
+
+    positions, heights = interpolate_peaks(spectra, np.where(found, bins, 1), log)
+    return np.where(found, positions*bin_width, np.nan), np.where(found, heights, np.nan)
+
+
+def identify_chords(freqs, chords=CHORDS, tolerance=TOLERANCE, min_notes=MIN_NOTES):
+    # Returns (names, scores) for every row of peak frequencies, as from
+    # find_peaks(). The score of a chord is matched / (chord notes + peaks -
+    # matched), so it is 1 when the peaks are exactly the chord and a chord
+    # whose notes are only a subset of the peaks (C in C7) scores lower. Rows
+    # matching fewer than min_notes notes of every chord get None.
+    freqs = np.asarray(freqs, dtype=np.float64)
+    names = list(chords)
+    notes = np.full((len(names), max(map(len, chords.values()))), np.nan)
+    for i, name in enumerate(names):
+        notes[i, :len(chords[name])] = chords[name]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # (..., chord, note, peak) distance in cents
+        cents = np.abs(1200*np.log2(freqs[..., None, None, :] / notes[:, :, None]))
+    matched = (cents <= tolerance).any(axis=-1).sum(axis=-1)
+    n_notes = np.isfinite(notes).sum(axis=-1)
+    n_peaks = np.isfinite(freqs).sum(axis=-1)[..., None]
+
+    scores = np.where(matched >= min_notes, matched / np.maximum(n_notes + n_peaks - matched, 1), 0.0)
+    best = scores.argmax(axis=-1)
+    best_score = np.take_along_axis(scores, best[..., None], axis=-1)[..., 0]
+    return np.where(best_score > 0, np.array(names, dtype=object)[best], None), best_score
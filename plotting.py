@@ -0,0 +1,55 @@
+# Headless plots of long series
+#
+#   save_plot(xf, np.abs(yf), "applying_fft/spectrum")   # -> media/plots/applying_fft/spectrum.png
+#
+# Uses matplotlib's non-interactive Agg backend and writes every plot to a PNG,
+# so scripts run to the end unattended instead of stopping at each plt.show().
+# A plot is at most WIDTH pixels across, so series longer than that are cut into
+# one bin per pixel and only each bin's minimum and maximum are drawn. That
+# draws the same picture (every spike still reaches its full height) from a few
+# thousand points instead of millions.
+#
+
+
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib import pyplot as plt
+import numpy as np
+
+PLOT_DIR = Path("media") / "plots"
+WIDTH, HEIGHT = 1600, 600 # Pixels
+DPI = 100
+
+
+def decimate(x, y, pixels=WIDTH):
+    # Returns (x, y) with at most 2 * pixels points: the minimum then the maximum
+    # of each of `pixels` equal runs of samples, at the x of the run's start.
+    x, y = np.asarray(x), np.asarray(y)
+    if len(y) <= 2*pixels:
+        return x, y
+
+    starts = np.linspace(0, len(y), pixels, endpoint=False).astype(int)
+    low = np.minimum.reduceat(y, starts)
+    high = np.maximum.reduceat(y, starts)
+    return np.repeat(x[starts], 2), np.column_stack((low, high)).reshape(-1)
+
+
+def save_plot(x, y=None, name="plot", title=None, xlabel=None, ylabel=None, grid=False, directory=PLOT_DIR):
+    # Like plt.plot(x, y) then plt.show(), but written to directory/<name>.png.
+    # With only x given it is plotted against its index. Returns the path.
+    if y is None:
+        x, y = np.arange(len(x)), x
+
+    fig, ax = plt.subplots(figsize=(WIDTH/DPI, HEIGHT/DPI), dpi=DPI)
+    ax.plot(*decimate(x, y), linewidth=0.8)
+    ax.set(title=title, xlabel=xlabel, ylabel=ylabel)
+    if grid:
+        ax.grid()
+
+    path = Path(directory) / f"{name}.png"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path)
+    plt.close(fig)
+    return path
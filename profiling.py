@@ -0,0 +1,254 @@
+# Frame-time profiler for scenes
+#
+#   PROFILE_SCENES=1 manim -ql main.py ApplyingFT
+#   python profiling.py media/profiles/ApplyingFT.json --sort updater
+#
+# or `python render_all.py --profile`. With PROFILE_SCENES set, a ProfiledScene
+# times every frame of every play() and splits it into
+#
+#   updater   the scene's own updater code (always_redraw lambdas, add_updater)
+#   geometry  building points: plot(), become(), set_points_as_corners, make_smooth
+#   tex       MathTex/Tex/Text construction, including LaTeX and SVG parsing
+#   raster    drawing the frame with cairo
+#   encode    handing the frame to ffmpeg
+#   other     everything else (animation interpolation, bookkeeping)
+#
+# Each category counts only time not already counted by one nested inside it, so
+# they add up to the frame time. Every updater is also timed on its own, labelled
+# with the line in the scene file that defined it. The report goes to
+# media/profiles/<Scene>.json. Profiled renders run with manim's cache disabled,
+# so every play is really rendered. Without PROFILE_SCENES nothing is wrapped.
+#
+
+
+from collections import Counter, defaultdict
+from pathlib import Path
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+
+from manim import config, Mobject, ParametricFunction, Scene, SingleStringMathTex, Text, VMobject
+import manim
+import numpy as np
+
+PROFILE_DIR = Path("media") / "profiles"
+CATEGORIES = ("updater", "geometry", "tex", "raster", "encode", "other")
+
+
+class FrameTimer:
+    def __init__(self):
+        self._stack = []
+        self.frame = Counter()
+        self.updaters = defaultdict(lambda: [0, 0.0]) # label -> [calls, seconds]
+
+    def wrap(self, category, function, label=None):
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            self._stack.append(0.0)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self.frame[category] += elapsed - self._stack.pop()
+                if self._stack:
+                    self._stack[-1] += elapsed
+                if label is not None:
+                    self.updaters[label][0] += 1
+                    self.updaters[label][1] += elapsed
+
+        timed._profiled = True
+        return timed
+
+
+def _user_code(function, manim_dir):
+    # always_redraw() and friends wrap the scene's lambda in one of manim's own,
+    # so look through the closure for the function the scene actually wrote.
+    code = getattr(function, "__code__", None)
+    if code is not None and code.co_filename.startswith(manim_dir):
+        for cell in function.__closure__ or ():
+            inner = _user_code(cell.cell_contents, manim_dir) if callable(cell.cell_contents) else None
+            if inner is not None:
+                return inner
+    return code
+
+
+PATCHED = (
+    ("geometry", ParametricFunction, "generate_points"),
+    ("geometry", VMobject, "set_points_as_corners"),
+    ("geometry", VMobject, "set_points_smoothly"),
+    ("geometry", VMobject, "make_smooth"),
+    ("geometry", Mobject, "become"),
+    ("tex", SingleStringMathTex, "__init__"),
+    ("tex", Text, "__init__"),
+)
+
+
+def _profiling_enabled():
+    return os.environ.get("PROFILE_SCENES", "") not in ("", "0")
+
+
+class ProfiledScene(Scene):
+    def setup(self):
+        super().setup()
+        self.profiling = _profiling_enabled()
+        if not self.profiling:
+            return
+
+        # A play served from the partial movie cache is skipped rather than
+        # rendered, so it would show up as one frame with no raster or encode
+        # time. The wrapped updaters would also change every play's hash and
+        # spoil the cache for the next normal render.
+        config.disable_caching = True
+
+        self.timer = FrameTimer()
+        self.profile = []
+        self._play = None
+        self._frame_start = None
+        self._manim_dir = os.path.dirname(manim.__file__)
+
+        self._patched = []
+        for category, cls, name in PATCHED:
+            original = cls.__dict__.get(name)
+            if original is not None:
+                self._patched.append((cls, name, original))
+                setattr(cls, name, self.timer.wrap(category, original))
+
+        camera = self.renderer.camera
+        writer = self.renderer.file_writer
+        camera.capture_mobjects = self.timer.wrap("raster", camera.capture_mobjects)
+        writer.write_frame = self.timer.wrap("encode", writer.write_frame)
+
+    def play(self, *args, **kwargs):
+        if not getattr(self, "profiling", False):
+            return super().play(*args, **kwargs)
+
+        self._play = {
+            "index": len(self.profile),
+            "line": self._caller_line(),
+            "animations": [
+                "animate" if type(animation).__name__ == "_AnimationBuilder" else type(animation).__name__
+                for animation in args
+            ],
+            "frame_ms": [],
+            "categories": Counter(),
+        }
+        start = time.perf_counter()
+        super().play(*args, **kwargs)
+        self._end_frame()
+
+        self._play["wall"] = time.perf_counter() - start
+        self.profile.append(self._play)
+        self._play = None
+
+    def update_to_time(self, t):
+        if getattr(self, "profiling", False) and self._play is not None:
+            if self._frame_start is None:
+                self._wrap_updaters()
+            self._end_frame()
+            self._frame_start = time.perf_counter()
+        super().update_to_time(t)
+
+    def tear_down(self):
+        if getattr(self, "profiling", False):
+            for cls, name, original in self._patched:
+                setattr(cls, name, original)
+            self.write_profile()
+        super().tear_down()
+
+    def _wrap_updaters(self):
+        # Mobjects an animation adds (Create, Write, ...) are on screen by the
+        # first frame of the play, so this catches those as well.
+        for mob in self.mobjects:
+            for sub in mob.get_family():
+                for i, updater in enumerate(sub.updaters):
+                    if not getattr(updater, "_profiled", False):
+                        code = _user_code(updater, self._manim_dir)
+                        label = f"{type(sub).__name__} {os.path.basename(code.co_filename)}:{code.co_firstlineno}" if code else repr(updater)
+                        sub.updaters[i] = self.timer.wrap("updater", updater, label)
+
+    def _end_frame(self):
+        if self._frame_start is None:
+            return
+        wall = time.perf_counter() - self._frame_start
+        frame = self.timer.frame
+        frame["other"] = max(0.0, wall - sum(frame.values()))
+
+        self._play["frame_ms"].append(wall * 1000)
+        self._play["categories"].update(frame)
+        self.timer.frame = Counter()
+        self._frame_start = None
+
+    def _caller_line(self):
+        scene_file = type(self).construct.__code__.co_filename
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_code.co_filename != scene_file:
+            frame = frame.f_back
+        return frame.f_lineno if frame else None
+
+    def write_profile(self):
+        plays = []
+        for play in self.profile:
+            frame_ms = np.array(play.pop("frame_ms") or [0.0])
+            play["frames"] = len(frame_ms)
+            play["mean_ms"] = float(frame_ms.mean())
+            play["p95_ms"] = float(np.percentile(frame_ms, 95))
+            play["max_ms"] = float(frame_ms.max())
+            play["categories"] = {category: play["categories"][category] for category in CATEGORIES}
+            plays.append(play)
+
+        totals = Counter()
+        for play in plays:
+            totals.update(play["categories"])
+
+        report = {
+            "scene": type(self).__name__,
+            "frames": sum(play["frames"] for play in plays),
+            "wall": sum(play["wall"] for play in plays),
+            "categories": {category: totals[category] for category in CATEGORIES},
+            "plays": plays,
+            "updaters": sorted(
+                ({"label": label, "calls": calls, "seconds": seconds} for label, (calls, seconds) in self.timer.updaters.items()),
+                key=lambda updater: updater["seconds"], reverse=True
+            ),
+        }
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        (PROFILE_DIR / f"{report['scene']}.json").write_text(json.dumps(report, indent=1))
+
+
+# ===== Report =====
+
+def print_report(report, sort="wall", top=15):
+    total = report["wall"] or 1
+    print(f"\n{report['scene']}: {report['frames']} frames, {report['wall']:.1f} s")
+    print("  " + "  ".join(f"{category} {report['categories'][category] / total:.0%}" for category in CATEGORIES))
+
+    def key(play):
+        return play["categories"][sort] if sort in CATEGORIES else play[sort]
+
+    print(f"\n  {'play':>5} {'line':>5} {'frames':>7} {'wall s':>8} {'p95 ms':>8}  " + " ".join(f"{c:>8}" for c in CATEGORIES))
+    for play in sorted(report["plays"], key=key, reverse=True)[:top]:
+        print(
+            f"  {play['index']:>5} {play['line'] or '?':>5} {play['frames']:>7} {play['wall']:>8.2f} {play['p95_ms']:>8.1f}  "
+            + " ".join(f"{play['categories'][c]:>8.2f}" for c in CATEGORIES)
+            + "  " + ", ".join(play["animations"])
+        )
+
+    print(f"\n  {'updater':<40} {'calls':>7} {'total s':>8} {'mean ms':>8}")
+    for updater in report["updaters"][:top]:
+        mean = updater["seconds"] / max(updater["calls"], 1) * 1000
+        print(f"  {updater['label']:<40} {updater['calls']:>7} {updater['seconds']:>8.2f} {mean:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show frame-time profiles written by ProfiledScene.")
+    parser.add_argument("reports", nargs="*", type=Path, help=f"default: every report in {PROFILE_DIR}")
+    parser.add_argument("--sort", default="wall", choices=("wall", "frames", "p95_ms", "max_ms", "mean_ms") + CATEGORIES)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for path in args.reports or sorted(PROFILE_DIR.glob("*.json")):
+        print_report(json.loads(path.read_text()), args.sort, args.top)
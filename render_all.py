@@ -0,0 +1,177 @@
+# Renders every scene in main.py in parallel and joins them into one video
+#
+#   python render_all.py                   # low quality preview of the video
+#   python render_all.py -q h -o final.mp4 # final render
+#   python render_all.py --scenes ApplyingFT FilteringSound
+#   python render_all.py --all --no-join   # every scene in the file, test scenes too
+#
+# Each scene is its own `manim` process, run up to one per core at a time. Scenes
+# that took longest last time are started first so the pool does not end up
+# waiting on one long scene at the end. Needs ffmpeg on the PATH for the final join.
+#
+
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from tex_cache import warm
+
+SCENE_FILE = Path("main.py")
+MEDIA_DIR = Path("media")
+TIMINGS = MEDIA_DIR / "render_times.json"
+
+# Order of the scenes in the finished video
+ORDER = (
+    "Integral",
+    "HistoryOfIntegration",
+    "DecomposingSound",
+    "IntroducingFT",
+    "ApplyingFT",
+    "IntegrationByParts",
+    "UnitImpulse",
+    "FilteringSound",
+    "Conclusion",
+)
+
+QUALITY_DIRS = {
+    "l": "480p15",
+    "m": "720p30",
+    "h": "1080p60",
+    "p": "1440p60",
+    "k": "2160p60",
+}
+
+
+def find_scenes(scene_file=SCENE_FILE):
+    # Classes in the file that derive from Scene (directly or through another
+    # class in the same file), found without importing manim.
+    tree = ast.parse(Path(scene_file).read_text())
+    bases = {
+        node.name: [base.id for base in node.bases if isinstance(base, ast.Name)]
+        for node in tree.body if isinstance(node, ast.ClassDef)
+    }
+
+    def is_scene(name, seen=()):
+        return any(
+            base.endswith("Scene") or (base in bases and base not in seen and is_scene(base, seen + (name,)))
+            for base in bases.get(name, ())
+        )
+
+    return [name for name in bases if is_scene(name)]
+
+
+def video_path(scene, quality, scene_file=SCENE_FILE, media_dir=MEDIA_DIR):
+    return media_dir / "videos" / Path(scene_file).stem / QUALITY_DIRS[quality] / f"{scene}.mp4"
+
+
+def render(scene, quality, scene_file=SCENE_FILE, extra_args=()):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "manim", f"-q{quality}", *extra_args, str(scene_file), scene],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    return scene, time.perf_counter() - start, result
+
+
+def render_all(scenes, quality, scene_file=SCENE_FILE, workers=None, extra_args=()):
+    # Returns {scene: seconds} for the scenes that rendered
+    previous = json.loads(TIMINGS.read_text()) if TIMINGS.exists() else {}
+    scenes = sorted(scenes, key=lambda scene: previous.get(scene, 0), reverse=True)
+
+    # The work happens in the manim processes; the threads only wait on them
+    timings, failed = {}, []
+    with ThreadPoolExecutor(workers or os.cpu_count()) as pool:
+        jobs = [pool.submit(render, scene, quality, scene_file, extra_args) for scene in scenes]
+        for job in as_completed(jobs):
+            scene, seconds, result = job.result()
+            if result.returncode == 0:
+                timings[scene] = seconds
+                print(f"{scene:<24} {seconds:8.1f} s")
+            else:
+                failed.append(scene)
+                print(f"{scene:<24}   FAILED\n{result.stdout[-2000:]}")
+
+    TIMINGS.parent.mkdir(parents=True, exist_ok=True)
+    TIMINGS.write_text(json.dumps({**previous, **timings}, indent=1))
+    if failed:
+        raise SystemExit(f"failed to render: {', '.join(failed)}")
+    return timings
+
+
+def concatenate(videos, output):
+    # Joins the clips without re-encoding, they all come out of manim with the
+    # same codec, resolution and frame rate.
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        for video in videos:
+            listing.write(f"file '{Path(video).resolve()}'\n")
+    try:
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+             "-i", listing.name, "-c", "copy", str(output)],
+            check=True
+        )
+    finally:
+        os.unlink(listing.name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the scenes of a manim file in parallel and join them.")
+    parser.add_argument("--file", type=Path, default=SCENE_FILE)
+    parser.add_argument("-q", "--quality", choices=QUALITY_DIRS, default="l")
+    parser.add_argument("--scenes", nargs="+", help="scenes to render (default: the ones in --order)")
+    parser.add_argument("--all", action="store_true", help="render every scene in the file")
+    parser.add_argument("--order", nargs="+", default=ORDER, help="scenes to join, in order")
+    parser.add_argument("-o", "--output", type=Path, help="joined video (default: media/<file>_<quality>.mp4)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--no-warm", action="store_true", help="skip precompiling the tex strings first")
+    parser.add_argument("--no-join", action="store_true")
+    parser.add_argument("--profile", action="store_true", help="write a frame-time profile of every scene")
+    parser.add_argument("--incremental", action="store_true",
+                        help="keep every partial movie file and report which segments were reused")
+    args, manim_args = parser.parse_known_args()
+
+    scenes = args.scenes or (find_scenes(args.file) if args.all else list(args.order))
+    unknown = set(scenes) - set(find_scenes(args.file))
+    if unknown:
+        raise SystemExit(f"not scenes in {args.file}: {', '.join(sorted(unknown))}")
+
+    if not args.no_warm:
+        warm([args.file], MEDIA_DIR, args.workers)
+
+    if args.incremental:
+        os.environ["INCREMENTAL_SCENES"] = "1"
+    if args.profile:
+        os.environ["PROFILE_SCENES"] = "1"
+
+    start = time.perf_counter()
+    timings = render_all(scenes, args.quality, args.file, args.workers, manim_args)
+    print(f"{'total (wall)':<24} {time.perf_counter() - start:8.1f} s, {sum(timings.values()):.1f} s of rendering")
+
+    if args.incremental:
+        from incremental import read_reports
+
+        print(f"\n{'scene':<24} {'reused':>8} {'rendered':>9} {'hit rate':>9}  re-rendered because")
+        for report in read_reports(MEDIA_DIR, args.file, QUALITY_DIRS[args.quality]):
+            if report["scene"] in timings:
+                reasons = ", ".join(f"{reason} x{count}" for reason, count in report["reasons"].items())
+                print(f"{report['scene']:<24} {report['reused']:>8} {report['rendered']:>9} {report['hit_rate']:>9.0%}  {reasons}")
+
+    if args.profile:
+        subprocess.run([sys.executable, "profiling.py", *(f"media/profiles/{scene}.json" for scene in timings)])
+
+    if not args.no_join:
+        videos = [video_path(scene, args.quality, args.file) for scene in args.order]
+        missing = [str(video) for video in videos if not video.exists()]
+        if missing:
+            raise SystemExit(f"can't join, missing: {', '.join(missing)}")
+        output = args.output or MEDIA_DIR / f"{args.file.stem}_{QUALITY_DIRS[args.quality]}.mp4"
+        concatenate(videos, output)
+        print(f"joined {len(videos)} scenes into {output}")
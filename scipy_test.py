@@ -1,7 +1,9 @@
-import matplotlib.pyplot as plt
-from scipy.fft import fft, fftfreq
 import numpy as np
 
+from peaks import find_peaks
+from plotting import save_plot
+from spectral import spectral_context
+
 # Number of sample points
 n = 15000
 # Sample spacing
@@ -15,16 +17,17 @@ f3 = lambda x: np.sin(2*np.pi*10*x)
 x = np.linspace(0, max_x, n)
 y = f1(x) + f2(x) + f3(x)
 
-plt.plot(x, y)
-plt.grid()
-plt.show()
+save_plot(x, y, "scipy_test/signal", grid=True)
 
-xf = fftfreq(n, max_x/n)[:n//2]
-yf = fft(y)
+spectrum = spectral_context(n, n/max_x, real=False)
+xf = spectrum.freqs[:n//2]
+yf = spectrum.forward(y)
 
-plt.plot(xf, 2/n*np.abs(yf[0:n//2]))
-plt.grid()
-plt.show()
+save_plot(xf, 2/n*np.abs(yf[0:n//2]), "scipy_test/spectrum", grid=True)
+
+# Should find 2.62, 3.30 and 10 Hz
+freqs, heights = find_peaks(2/n*np.abs(yf[0:n//2]), threshold=0.2, bin_width=xf[1])
+print(freqs[~np.isnan(freqs)])
 
 '''
 f1 = 5
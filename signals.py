@@ -0,0 +1,243 @@
+# Named signals, sampled once per x-grid
+#
+# The chord lambdas in main.py used to be handed straight to axes.plot(), which
+# evaluates them again for every graph. Registering them here means each
+# (signal, x_range, resolution) grid is evaluated once, as a single NumPy call,
+# and every later plot of it reuses the cached arrays:
+#
+#   C7_CHORD = register("C7_CHORD", lambda x: np.sin(262*x) + ...)
+#   x, y = SIGNALS.sample("C7_CHORD", (0, 6), 0.1)
+#
+# The piecewise signals (triangle, rect, step and nascent deltas) are built from
+# np.piecewise/np.where, so they take whole arrays like the chords do, rather
+# than being if/else functions called once per sample. The standard ones are
+# registered under their own names, which transforms.py also knows them by.
+#
+# Fast chords are better sampled adaptively than on the uniform Axes.plot()
+# grid, which at 262-698 rad/s lands a few samples per period at best:
+#
+#   register("C7_CHORD", lambda x: ..., max_freq=494)
+#   x, y = SIGNALS.sample_adaptive("C7_CHORD", (0, 6), budget=8000, tolerance=0.04, smooth=True)
+#
+# starts from a uniform grid with a few samples per period of max_freq (the
+# fastest component, in radians per unit of x) and keeps halving only the
+# segments whose midpoint is furthest off what the plot would draw there: the
+# straight segment, or with smooth the cubic a smoothed plot draws. It stops
+# when every segment is within tolerance, or at the budget. Without a max_freq
+# the start grid is START segments, which suits slow or piecewise signals.
+#
+
+
+from collections import OrderedDict
+
+import numpy as np
+
+CACHE_SIZE = 64 # Sampled grids kept before the least recently used is dropped
+BUDGET = 4000 # Most points an adaptive grid may use
+START = 256 # Uniform segments an adaptive grid starts from, when nothing better is known
+SAMPLES_PER_PERIOD = 3 # Start grid density for signals registered with a max_freq
+
+
+def _interpolate_midpoints(x, y, x_mid, smooth):
+    # What a plot through (x, y) shows at the middle of every segment: the
+    # straight line between its ends, or with smooth the cubic through those and
+    # the vertex either side, close to the Bezier curve make_smooth() draws.
+    # The end segments have no outer vertex and keep the straight line.
+    guess = (y[..., :-1] + y[..., 1:]) / 2
+    if smooth and len(x) > 3:
+        nodes = np.stack([x[:-3], x[1:-2], x[2:-1], x[3:]])
+        t = x_mid[1:-1]
+        weights = np.ones_like(nodes)
+        for k in range(4):
+            for j in range(4):
+                if j != k:
+                    weights[k] *= (t - nodes[j]) / (nodes[k] - nodes[j])
+        guess[..., 1:-1] = sum(weights[k] * y[..., k:len(x) - 3 + k] for k in range(4))
+    return guess
+
+
+def adaptive_grid(function, x_range, budget=BUDGET, tolerance=0.01, start=START, smooth=False):
+    # Returns (x, y), at most `budget` points refined where function(x) bends.
+    # function may return several rows (..., len(x)); a segment is then split
+    # while any row is off by more than tolerance. smooth measures the error
+    # against the cubic a smoothed plot draws rather than the straight segment,
+    # which a curve meets with far fewer points. start must be fine enough to
+    # see every wiggle at least once (see samples_for()), since a segment whose
+    # midpoint happens to land on the curve looks finished.
+    x_min, x_max = x_range
+    def evaluate(x):
+        y = np.asarray(function(x), dtype=np.float64)
+        return np.broadcast_to(y, y.shape[:-1] + x.shape)
+
+    x = np.linspace(x_min, x_max, max(2, min(start, budget - 1) + 1))
+    y = evaluate(x)
+    x_mid = (x[:-1] + x[1:]) / 2
+    y_mid = evaluate(x_mid)
+    while True:
+        # Splitting a segment changes the cubic of its neighbours too, so the
+        # errors are worked out afresh each pass from the stored midpoints
+        miss = np.abs(y_mid - _interpolate_midpoints(x, y, x_mid, smooth))
+        error = miss.reshape(-1, len(x_mid)).max(axis=0)
+
+        split = np.flatnonzero(error > tolerance)
+        room = budget - len(x)
+        if not len(split) or room <= 0:
+            break
+        if len(split) > room:
+            split = np.sort(split[np.argpartition(error[split], -room)[-room:]])
+
+        # Each split segment's midpoint becomes a vertex and only the midpoints
+        # of its two halves are evaluated
+        x = np.insert(x, split + 1, x_mid[split])
+        y = np.insert(y, split + 1, y_mid[..., split], axis=-1)
+        left = split + np.arange(len(split))
+        halves = np.concatenate((left, left + 1))
+        x_mid = np.insert(x_mid, split + 1, 0)
+        y_mid = np.insert(y_mid, split + 1, 0, axis=-1)
+        x_mid[halves] = (x[halves] + x[halves + 1]) / 2
+        y_mid[..., halves] = evaluate(x_mid[halves])
+    return x, y
+
+
+def samples_for(max_freq, x_range, per_period=SAMPLES_PER_PERIOD):
+    # Uniform segments that put per_period samples in every period of the fastest
+    # component, max_freq in radians per unit of x
+    return int(np.ceil((x_range[1] - x_range[0]) * max_freq / (2*np.pi) * per_period))
+
+
+def _same_definition(a, b):
+    # True for the same function, or two lambdas built by the same expression
+    # with the same defaults and captured values (e.g. re-created in a loop)
+    if a is b:
+        return True
+    code_a, code_b = getattr(a, "__code__", None), getattr(b, "__code__", None)
+    if code_a is None or code_a != code_b or a.__defaults__ != b.__defaults__:
+        return False
+    cells_a, cells_b = a.__closure__ or (), b.__closure__ or ()
+    return len(cells_a) == len(cells_b) and all(
+        x.cell_contents is y.cell_contents for x, y in zip(cells_a, cells_b)
+    )
+
+
+class SignalRegistry:
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.functions = {}
+        self.max_freqs = {}
+        self.maxsize = maxsize
+        # (kind, name, grid arguments) -> (x, y), least recently used first
+        self._cache = OrderedDict()
+        self.hits = self.misses = 0
+
+    def register(self, name, function, max_freq=None):
+        # Returns the function so it can still be assigned to a module constant.
+        # max_freq, if known, is its fastest angular frequency, for sample_adaptive().
+        # Only a new definition of name drops its cached grids; other signals
+        # keep theirs, and re-registering the same definition changes nothing.
+        self.max_freqs[name] = max_freq
+        if name not in self.functions or not _same_definition(self.functions[name], function):
+            self.functions[name] = function
+            for key in [key for key in self._cache if key[1] == name]:
+                del self._cache[key]
+        return self.functions[name]
+
+    def __getitem__(self, name):
+        return self.functions[name]
+
+    def __contains__(self, name):
+        return name in self.functions
+
+    def sample(self, name, x_range, resolution):
+        # Returns read-only (x, y) arrays on the same grid Axes.plot() uses:
+        # x_min, x_min + resolution, ... up to but not including x_max, then x_max.
+        x_min, x_max = x_range
+        return self._cached(self._evaluate, "uniform", name, float(x_min), float(x_max), float(resolution))
+
+    def sample_adaptive(self, name, x_range, budget=BUDGET, tolerance=0.01, smooth=False):
+        # Read-only (x, y) from adaptive_grid(), tolerance in the units of y
+        x_min, x_max = x_range
+        max_freq = self.max_freqs.get(name)
+        start = START if max_freq is None else samples_for(max_freq, x_range)
+        return self._cached(
+            self._evaluate_adaptive, "adaptive", name,
+            float(x_min), float(x_max), int(budget), float(tolerance), start, bool(smooth)
+        )
+
+    def cache_info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "maxsize": self.maxsize}
+
+    def _cached(self, evaluate, kind, name, *args):
+        key = (kind, name) + args
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        self.misses += 1
+        self._cache[key] = value = evaluate(name, *args)
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return value
+
+    def _evaluate(self, name, x_min, x_max, resolution):
+        x = np.append(np.arange(x_min, x_max, resolution), x_max)
+        y = np.broadcast_to(np.asarray(self.functions[name](x), dtype=np.float64), x.shape).copy()
+
+        x.setflags(write=False)
+        y.setflags(write=False)
+        return x, y
+
+    def _evaluate_adaptive(self, name, x_min, x_max, budget, tolerance, start, smooth):
+        x, y = adaptive_grid(self.functions[name], (x_min, x_max), budget, tolerance, start, smooth)
+        y = y.copy()
+        x.setflags(write=False)
+        y.setflags(write=False)
+        return x, y
+
+
+SIGNALS = SignalRegistry()
+register = SIGNALS.register
+
+
+# ===== Piecewise signals =====
+
+def piecewise(*pieces, otherwise=0.0):
+    # Builds f(t) from ((low, high), function) pieces, each covering
+    # low <= t < high. Where pieces overlap the last one wins, and t outside all
+    # of them gives `otherwise`. A piece's function can also be a constant.
+    def f(t):
+        t = np.asarray(t, dtype=np.float64)
+        conditions = [(low <= t) & (t < high) for (low, high), _ in pieces]
+        return np.piecewise(t, conditions, [function for _, function in pieces] + [otherwise])
+    return f
+
+
+def triangle(t, width=1.0):
+    # Lambda(t/width): 1 at t = 0, falling linearly to 0 at t = +/-width
+    return np.maximum(0.0, 1 - np.abs(np.asarray(t, dtype=np.float64)) / width)
+
+
+def rect(t, width=1.0):
+    # 1 for |t| < width/2, 1/2 on the edges, 0 outside
+    t = np.abs(np.asarray(t, dtype=np.float64))
+    return np.where(t < width/2, 1.0, np.where(t == width/2, 0.5, 0.0))
+
+
+def step(t):
+    # Heaviside step, 1/2 at t = 0
+    return np.heaviside(np.asarray(t, dtype=np.float64), 0.5)
+
+
+def delta(t, width=0.01, shape="gaussian"):
+    # Unit-area pulse of the given width standing in for delta(t); it tends to
+    # the real thing as width -> 0.
+    t = np.asarray(t, dtype=np.float64)
+    if shape == "gaussian":
+        return np.exp(-0.5*(t/width)**2) / (width*np.sqrt(2*np.pi))
+    if shape == "rect":
+        return rect(t, width) / width
+    if shape == "triangle":
+        return triangle(t, width) / width
+    raise ValueError(f"unknown delta shape {shape!r}")
+
+
+for _name, _function in (("triangle", triangle), ("rect", rect), ("step", step), ("delta", delta)):
+    register(_name, _function)
@@ -0,0 +1,86 @@
+# Shared set-up for FFTs of a given length
+#
+#   ctx = spectral_context(n, SAMPLE_RATE)          # rfft of n samples
+#   yf = ctx.forward(signal)
+#   ctx.freqs, ctx.bin(4000), ctx.bins((3900, 4100))
+#
+# Everything that only depends on (n, sample_rate, real or complex) is worked
+# out once and kept: the bin width, the number of bins and frequency -> bin
+# lookups. spectral_context() hands back the same object for the same key, so
+# the scripts, filters and STFT frames all share it. Contexts hold nothing the
+# size of the signal; the frequency axis is built when asked for, so the cache
+# never keeps long arrays alive. Transforms go through scipy.fft with
+# workers=WORKERS (every core by default), and scipy.fft keeps its own plan
+# cache per length, so repeated transforms of same-length clips go straight to
+# the FFT itself.
+#
+
+
+from functools import lru_cache
+
+from scipy import fft as sp_fft
+import numpy as np
+
+WORKERS = -1 # scipy.fft threads, -1 for one per core
+CONTEXTS = 32 # (n, sample_rate, real) keys kept
+
+
+class SpectralContext:
+    def __init__(self, n, sample_rate=1.0, real=True, workers=WORKERS):
+        if n < 1:
+            raise ValueError(f"n must be positive, got {n}")
+        self.n = n
+        self.sample_rate = sample_rate
+        self.real = real
+        self.workers = workers
+        self.bin_width = sample_rate / n
+        self.n_bins = n//2 + 1 if real else n
+
+    @property
+    def freqs(self):
+        # Frequency of every bin, a new array each time, so keep it if you need it twice
+        if self.real:
+            return sp_fft.rfftfreq(self.n, 1/self.sample_rate)
+        return sp_fft.fftfreq(self.n, 1/self.sample_rate)
+
+    def bin(self, freq):
+        # Index of the bin nearest freq (array or scalar), negative frequencies
+        # wrapping round to the top half for complex transforms
+        index = np.rint(np.asarray(freq) / self.bin_width).astype(int)
+        if not self.real:
+            index %= self.n
+        elif np.any((index < 0) | (index >= self.n_bins)):
+            raise ValueError(f"frequency outside 0 .. {(self.n_bins - 1) * self.bin_width} Hz")
+        return index
+
+    def bins(self, f_range):
+        # Slice of the non-negative bins from f_range[0] to f_range[1] Hz inclusive.
+        # The small tolerance keeps an edge that lands exactly on a bin from being
+        # lost to rounding.
+        positive = self.n_bins if self.real else (self.n + 1) // 2
+        low = int(np.ceil(f_range[0] / self.bin_width - 1e-9))
+        high = int(np.floor(f_range[1] / self.bin_width + 1e-9)) + 1
+        return slice(min(max(0, low), positive), min(max(0, high), positive))
+
+    def forward(self, signal, axis=-1, overwrite_x=False):
+        if self.real:
+            return sp_fft.rfft(signal, self.n, axis, workers=self.workers, overwrite_x=overwrite_x)
+        return sp_fft.fft(signal, self.n, axis, workers=self.workers, overwrite_x=overwrite_x)
+
+    def inverse(self, spectrum, axis=-1, overwrite_x=False):
+        if self.real:
+            return sp_fft.irfft(spectrum, self.n, axis, workers=self.workers, overwrite_x=overwrite_x)
+        return sp_fft.ifft(spectrum, self.n, axis, workers=self.workers, overwrite_x=overwrite_x)
+
+    def amplitude(self, signal, axis=-1):
+        # Single-sided amplitude spectrum (non-negative bins only), scaled so a
+        # sine of amplitude A shows as A, as in 2/n*np.abs(yf[:n//2])
+        spectrum = self.forward(signal, axis)
+        if not self.real:
+            spectrum = np.take(spectrum, np.arange((self.n + 1) // 2), axis)
+        return 2/self.n * np.abs(spectrum)
+
+
+@lru_cache(CONTEXTS)
+def spectral_context(n, sample_rate=1.0, real=True, workers=WORKERS):
+    return SpectralContext(n, sample_rate, real, workers)
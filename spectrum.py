@@ -0,0 +1,118 @@
+# Spectrum analysis of the recorded clips in media/Presentation
+#
+#   python spectrum.py                          # every clip, table to media/spectra.csv
+#   python spectrum.py media/Presentation/3sec_C7.ogg --peaks 4
+#
+# These are the recorded versions of the C7_CHORD/FSM7_CHORD/C_NOISE signals in
+# main.py. Each clip is decoded, mixed down to mono and put through an rfft like
+# scipy_test.py does, and the strongest peaks of its magnitude spectrum are
+# listed with the nearest note and the chord they make up. Clips are
+# independent, so they are spread over a process pool, one clip per worker.
+#
+
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import csv
+import os
+import time
+
+import numpy as np
+import soundfile
+
+from peaks import find_peaks, identify_chords
+from spectral import spectral_context, WORKERS
+
+CLIP_DIR = Path("media") / "Presentation"
+RESULTS = Path("media") / "spectra.csv"
+AUDIO_SUFFIXES = (".ogg", ".wav", ".flac")
+
+PEAKS = 6
+THRESHOLD = 0.05 # Fraction of the largest peak
+MIN_SPACING = 20 # Hertz between peaks
+
+NOTE_NAMES = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
+
+
+def note_name(freq):
+    # Nearest equal-tempered note, A4 = 440 Hz
+    if freq <= 0:
+        return ""
+    midi = int(round(69 + 12*np.log2(freq / 440)))
+    return f"{NOTE_NAMES[midi % 12]}{midi // 12 - 1}"
+
+
+def read_clip(path):
+    # Returns (mono float32 samples, sample rate)
+    data, sample_rate = soundfile.read(path, dtype="float32", always_2d=True)
+    return data.mean(axis=1), sample_rate
+
+
+def magnitude_spectrum(samples, sample_rate, fft_workers=WORKERS):
+    # Single-sided amplitude spectrum, scaled so a sine of amplitude A shows as A
+    context = spectral_context(len(samples), sample_rate, workers=fft_workers)
+    return context.freqs, context.amplitude(samples)
+
+
+def analyze_clip(path, peaks=PEAKS, threshold=THRESHOLD, min_spacing=MIN_SPACING, fft_workers=WORKERS):
+    samples, sample_rate = read_clip(path)
+    xf, yf = magnitude_spectrum(samples, sample_rate, fft_workers)
+
+    bin_width = xf[1]
+    freqs, heights = find_peaks(yf, threshold, max(1, round(min_spacing / bin_width)), peaks, bin_width=bin_width)
+    chord, _ = identify_chords(freqs)
+    found = ~np.isnan(freqs)
+
+    return {
+        "clip": Path(path).name,
+        "sample_rate": sample_rate,
+        "seconds": len(samples) / sample_rate,
+        "peaks": list(zip(freqs[found].tolist(), heights[found].tolist())),
+        "chord": chord.item() or "",
+    }
+
+
+def analyze_all(paths, workers=None, **kwargs):
+    # One FFT thread per process, the pool already keeps every core busy
+    with ProcessPoolExecutor(workers) as pool:
+        jobs = [pool.submit(analyze_clip, path, fft_workers=1, **kwargs) for path in paths]
+        return [job.result() for job in jobs]
+
+
+def write_results(results, output):
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["clip", "sample_rate", "seconds", "chord", "peak_hz", "amplitude", "note"])
+        for result in results:
+            for freq, amplitude in result["peaks"]:
+                writer.writerow([
+                    result["clip"], result["sample_rate"], f"{result['seconds']:.3f}", result["chord"],
+                    f"{freq:.2f}", f"{amplitude:.5f}", note_name(freq)
+                ])
+
+
+def print_results(results):
+    for result in results:
+        peaks = "  ".join(f"{freq:7.1f} {note_name(freq):<3}" for freq, _ in result["peaks"])
+        print(f"{result['clip']:<26} {result['seconds']:6.2f} s  {result['chord']:<7} {peaks}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find the peak frequencies of audio clips.")
+    parser.add_argument("clips", nargs="*", type=Path, help=f"default: every clip in {CLIP_DIR}")
+    parser.add_argument("-o", "--output", type=Path, default=RESULTS)
+    parser.add_argument("--peaks", type=int, default=PEAKS, help="peaks to report per clip")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="relative to the largest peak")
+    parser.add_argument("--min-spacing", type=float, default=MIN_SPACING, help="Hz between peaks")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    clips = args.clips or sorted(path for path in CLIP_DIR.iterdir() if path.suffix in AUDIO_SUFFIXES)
+
+    start = time.perf_counter()
+    results = analyze_all(clips, args.workers, peaks=args.peaks, threshold=args.threshold, min_spacing=args.min_spacing)
+    print_results(results)
+    write_results(results, args.output)
+    print(f"{len(clips)} clips in {time.perf_counter() - start:.1f} s, table in {args.output}")
@@ -0,0 +1,84 @@
+# Short-time Fourier transform
+#
+#   stft = STFT(SAMPLE_RATE, frame_size=4096, hop=1024, nfft=16384)
+#   magnitudes = stft.spectrogram(signal)    # (frames, bins)
+#   stft.times(len(signal)), stft.freqs      # axes of the matrix
+#
+# The frames are a strided view of the signal (np.lib.stride_tricks), so cutting
+# it into overlapping frames copies nothing. Frames are windowed and transformed
+# a chunk at a time into one reused buffer, so memory stays at the size of the
+# output however long the signal is. nfft larger than frame_size zero-pads each
+# frame, which gives finer frequency bins to draw (not finer resolution).
+#
+
+
+from scipy.signal import get_window
+import numpy as np
+
+from spectral import spectral_context
+
+FRAME_SIZE = 4096
+CHUNK_FRAMES = 256 # Frames windowed and transformed per pass
+
+
+def frame_view(signal, frame_size, hop):
+    # (frames, frame_size) read-only view of a 1-D signal, frame i starting at i*hop
+    signal = np.asarray(signal)
+    if signal.ndim != 1:
+        raise ValueError(f"expected a 1-D signal, got shape {signal.shape}")
+    if len(signal) < frame_size:
+        raise ValueError(f"signal of {len(signal)} samples is shorter than one frame ({frame_size})")
+    return np.lib.stride_tricks.sliding_window_view(signal, frame_size)[::hop]
+
+
+class STFT:
+    def __init__(self, sample_rate, frame_size=FRAME_SIZE, hop=None, nfft=None, window="hann"):
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop = hop or frame_size // 4
+        self.nfft = nfft or frame_size
+        if self.nfft < frame_size:
+            raise ValueError(f"nfft ({self.nfft}) must be at least frame_size ({frame_size})")
+
+        self.window = get_window(window, frame_size).astype(np.float32)
+        # Scales a sine of amplitude A to a peak of A, as 2/n does for a bare rfft
+        self.scale = 2 / self.window.sum()
+        self.context = spectral_context(self.nfft, sample_rate)
+        self.freqs = self.context.freqs
+
+    def frames(self, signal):
+        return frame_view(signal, self.frame_size, self.hop)
+
+    def n_frames(self, n_samples):
+        return (n_samples - self.frame_size) // self.hop + 1
+
+    def times(self, n_samples):
+        # Time of the centre of every frame, in seconds
+        return (np.arange(self.n_frames(n_samples))*self.hop + self.frame_size/2) / self.sample_rate
+
+    def transform(self, signal):
+        # Complex (frames, bins) STFT
+        frames = self.frames(signal)
+        out = np.empty((len(frames), len(self.freqs)), dtype=np.complex64)
+        scratch = np.empty((min(CHUNK_FRAMES, len(frames)), self.frame_size), dtype=np.float32)
+        for start in range(0, len(frames), CHUNK_FRAMES):
+            chunk = frames[start:start + CHUNK_FRAMES]
+            windowed = scratch[:len(chunk)]
+            np.multiply(chunk, self.window, out=windowed, casting="unsafe")
+            out[start:start + len(chunk)] = self.context.forward(windowed)
+        return out
+
+    def spectrogram(self, signal, f_range=None, db=False, floor=-80):
+        # Magnitude (frames, bins) matrix, optionally only the bins in f_range
+        # and in decibels relative to an amplitude of 1, clipped at floor.
+        magnitudes = np.abs(self.transform(signal))
+        magnitudes *= self.scale
+        if f_range is not None:
+            magnitudes = magnitudes[:, self.bins(f_range)]
+        if db:
+            magnitudes = np.maximum(20*np.log10(np.maximum(magnitudes, 1e-12)), floor)
+        return magnitudes
+
+    def bins(self, f_range):
+        # Slice of the bins from f_range[0] to f_range[1] Hz inclusive
+        return self.context.bins(f_range)
@@ -0,0 +1,145 @@
+# Streaming version of the denoise in applying_fft.py
+#
+#   python stream_filter.py noisy.wav clean.wav --band 3900 4100
+#
+# applying_fft.py runs one rfft over the whole recording, zeroes the bins around the
+# noise and runs one irfft. That needs the whole signal in memory, so here the same
+# rfft -> zero bins -> irfft steps run on short overlapping frames instead
+# (overlap-add STFT), all the frames of a block in one batched transform. Both
+# files are memory-mapped (wavmap.py): the input is read in fixed-size slices of
+# the map and each filtered block is written straight into the mapped output, so
+# memory use does not depend on the length of the recording.
+#
+
+
+import argparse
+
+import numpy as np
+
+from filters import SpectralMask
+from wavmap import create_wav, open_wav
+
+BLOCK_SIZE = 65536 # Samples read from the file at a time
+FRAME_SIZE = 4096  # Samples per FFT frame
+
+
+class StreamingFilter:
+    def __init__(self, bands, sample_rate, frame_size=FRAME_SIZE):
+        if frame_size % 2:
+            raise ValueError("frame_size must be even")
+
+        self.frame_size = frame_size
+        self.hop = frame_size // 2
+
+        # sqrt-Hann on the way in and on the way out: the product is a Hann window,
+        # which sums to exactly 1 at 50% overlap, so an empty band list gives back
+        # the input unchanged.
+        self.window = np.sqrt(np.hanning(frame_size + 1)[:-1])
+
+        self.mask = SpectralMask(bands, sample_rate, frame_size)
+
+        self.reset()
+
+    def reset(self, channels=1):
+        # Start with one hop of silence so the first samples get the same
+        # two overlapping frames as everything after them.
+        self._pending = np.zeros((self.frame_size - self.hop, channels))
+        self._overlap = np.zeros((channels, self.hop))
+        self._to_skip = self.frame_size - self.hop
+        self._samples_in = 0
+        self._samples_out = 0
+
+    def process(self, block):
+        # Takes a (samples, channels) block and returns every output sample that
+        # is already final. The rest is held back until the next block.
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[:, None]
+        if self._samples_in == 0 and block.shape[1] != self._pending.shape[1]:
+            self.reset(block.shape[1])
+        self._samples_in += len(block)
+
+        self._pending = np.concatenate((self._pending, block))
+        channels = self._pending.shape[1]
+        n_frames = max(0, (len(self._pending) - self.frame_size) // self.hop + 1)
+        if n_frames == 0:
+            return self._emit(np.empty((0, channels)))
+
+        # Every whole frame of the block, all channels, through one rfft/irfft:
+        # (frames, channels, frame_size) from a strided view of the pending samples
+        frames = np.lib.stride_tricks.sliding_window_view(self._pending, self.frame_size, axis=0)
+        frames = frames[:n_frames*self.hop:self.hop] * self.window
+        filtered = self.mask.apply_batch(frames.reshape(-1, self.frame_size))
+        filtered = filtered.reshape(n_frames, channels, self.frame_size) * self.window
+
+        # At 50% overlap each hop of output is the first half of one frame plus
+        # the second half of the frame before it
+        out = filtered[:, :, :self.hop].copy()
+        out[0] += self._overlap
+        out[1:] += filtered[:-1, :, self.hop:]
+        self._overlap = filtered[-1, :, self.hop:].copy()
+
+        self._pending = self._pending[n_frames*self.hop:]
+        return self._emit(out.transpose(0, 2, 1).reshape(-1, channels))
+
+    def flush(self):
+        # Push the last partial frame through with trailing silence and cut the
+        # output back to the exact input length.
+        samples_in = self._samples_in
+        out = self.process(np.zeros((self.frame_size, self._pending.shape[1])))
+        self._samples_in = samples_in
+
+        out = out[:max(0, samples_in - (self._samples_out - len(out)))]
+        self._samples_out = samples_in
+        return out
+
+    def _emit(self, out):
+        skip = min(self._to_skip, len(out))
+        self._to_skip -= skip
+        out = out[skip:]
+        self._samples_out += len(out)
+        return out
+
+
+def read_blocks(data, block_size=BLOCK_SIZE):
+    # Yields (samples, channels) views of a mapped int16 WAV, nothing is copied
+    if data.dtype != np.dtype("<i2"):
+        raise ValueError("only 16-bit PCM WAV files are supported")
+
+    for start in range(0, len(data), block_size):
+        yield data[start:start + block_size]
+
+
+def write_block(out, start, block):
+    # Rounds and clips a float block into out[start:] and returns where it ends
+    np.rint(block, out=block)
+    np.clip(block, -32768, 32767, out=block)
+    out[start:start + len(block)] = block
+    return start + len(block)
+
+
+def filter_wav(in_path, out_path, bands, block_size=BLOCK_SIZE, frame_size=FRAME_SIZE):
+    sample_rate, data = open_wav(in_path)
+    out = create_wav(out_path, sample_rate, len(data), data.shape[1])
+
+    engine = StreamingFilter(bands, sample_rate, frame_size)
+    engine.reset(data.shape[1])
+    position = 0
+    for block in read_blocks(data, block_size):
+        position = write_block(out, position, engine.process(block))
+    write_block(out, position, engine.flush())
+    if isinstance(out, np.memmap):
+        out.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Remove frequency bands from a WAV file in blocks.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--band", nargs=2, type=float, action="append", metavar=("LOW", "HIGH"),
+                        help="band to remove in Hz, can be given more than once (default: 3900 4100)")
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE)
+    parser.add_argument("--frame-size", type=int, default=FRAME_SIZE)
+    args = parser.parse_args()
+
+    filter_wav(args.input, args.output, args.band or [(3900, 4100)], args.block_size, args.frame_size)
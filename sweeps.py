@@ -0,0 +1,126 @@
+# Precomputed omega sweeps
+#
+# ApplyingFT and FilteringSound animate a tracker through values of omega and
+# redraw f(t)cos(omega t) (or sin) and its area every frame. A SweepTable
+# evaluates that integrand for every omega on a fine grid across the sweep in
+# one vectorised pass, along with the integral of each row, and keeps the
+# result in a compressed .npz under media/sweeps:
+#
+#   table = SweepTable.cached(lambda w: signal*np.sin(w*x), x, (1, 2.62, 3.3, 3.92, 11))
+#   samples = TrackedSamples(n, table.samples)      # row for the tracker value
+#   area = table.area(n.get_value())
+#
+# Looking up a value blends the two grid rows either side of it, so no part of
+# the integrand is evaluated while rendering. The values given as stops (the
+# ones the scene pauses on) are always exact grid rows, and looking up a value
+# outside the smallest and largest stop raises a ValueError rather than quietly
+# showing the nearest end of the sweep. The cache file is named
+# after a fingerprint of the function (code and captured values), x and the
+# grid, so changing any of them builds a new table.
+#
+
+
+from pathlib import Path
+import hashlib
+
+from scipy.integrate import trapezoid
+import numpy as np
+
+SWEEP_DIR = Path("media") / "sweeps"
+STEP = 0.005 # Spacing of the omega grid
+ROWS_PER_PASS = 512 # Rows evaluated at once while building
+
+
+def fingerprint(*objects):
+    # Hash of functions (their code and whatever their closures capture),
+    # arrays and plain values, for naming cache files
+    digest = hashlib.sha256()
+
+    def feed(obj):
+        code = getattr(obj, "__code__", None)
+        if code is not None:
+            digest.update(code.co_code + repr(code.co_consts).encode() + repr(code.co_names).encode())
+            for cell in obj.__closure__ or ():
+                feed(cell.cell_contents)
+        elif isinstance(obj, np.ndarray):
+            digest.update(repr((obj.dtype.str, obj.shape)).encode() + np.ascontiguousarray(obj).tobytes())
+        elif isinstance(obj, (tuple, list)):
+            for item in obj:
+                feed(item)
+        else:
+            digest.update(repr(obj).encode())
+
+    for obj in objects:
+        feed(obj)
+    return digest.hexdigest()[:20]
+
+
+def sweep_grid(stops, step=STEP):
+    # Evenly spaced omegas from the smallest stop to the largest, plus the stops
+    stops = np.asarray(stops, dtype=np.float64)
+    low, high = stops.min(), stops.max()
+    grid = np.linspace(low, high, max(2, int(np.ceil((high - low) / step)) + 1))
+    return np.union1d(grid, stops)
+
+
+class SweepTable:
+    def __init__(self, x, omegas, values, areas):
+        self.x = x
+        self.omegas = omegas
+        self.values = values
+        self.areas = areas
+
+    @classmethod
+    def build(cls, function, x, omegas, dtype=np.float32):
+        # function(w) must broadcast over a column of omegas, e.g.
+        # lambda w: signal*np.sin(w*x) gives one row of the matrix per omega.
+        x = np.asarray(x, dtype=np.float64)
+        omegas = np.asarray(omegas, dtype=np.float64)
+        values = np.empty((len(omegas), len(x)), dtype=dtype)
+        areas = np.empty(len(omegas))
+        for start in range(0, len(omegas), ROWS_PER_PASS):
+            w = omegas[start:start + ROWS_PER_PASS, None]
+            rows = np.broadcast_to(function(w), (len(w), len(x)))
+            values[start:start + len(rows)] = rows
+            areas[start:start + len(rows)] = trapezoid(rows, x, axis=1)
+        return cls(x, omegas, values, areas)
+
+    @classmethod
+    def cached(cls, function, x, stops, step=STEP, directory=SWEEP_DIR):
+        omegas = sweep_grid(stops, step)
+        path = Path(directory) / f"{fingerprint(function, np.asarray(x, dtype=np.float64), omegas)}.npz"
+        if path.exists():
+            return cls.load(path)
+        table = cls.build(function, x, omegas)
+        table.save(path)
+        return table
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, x=self.x, omegas=self.omegas, values=self.values, areas=self.areas)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["x"], data["omegas"], data["values"], data["areas"])
+
+    def _locate(self, omega):
+        # (row, weight of the next row) for omega
+        if not self.omegas[0] <= omega <= self.omegas[-1]:
+            raise ValueError(f"omega {omega} outside the sweep {self.omegas[0]} .. {self.omegas[-1]}, add it to the stops")
+        i = int(np.clip(np.searchsorted(self.omegas, omega) - 1, 0, len(self.omegas) - 2))
+        low, high = self.omegas[i], self.omegas[i + 1]
+        return i, float((omega - low) / (high - low))
+
+    def samples(self, omega):
+        i, t = self._locate(omega)
+        if t == 0:
+            return self.values[i]
+        if t == 1:
+            return self.values[i + 1]
+        return (1 - t)*self.values[i] + t*self.values[i + 1]
+
+    def area(self, omega):
+        i, t = self._locate(omega)
+        return (1 - t)*self.areas[i] + t*self.areas[i + 1]
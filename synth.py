@@ -0,0 +1,108 @@
+# Vectorised tone synthesis
+#
+# Builds a mix of sine tones in one go instead of calling generate_sine_wave once
+# per tone and adding the results together:
+#
+#   mixed_tone = synthesize([400, 4000], [1, 0.3], SAMPLE_RATE, 5)
+#
+# freqs/amps/phases broadcast together, and a 2-D freqs array gives one row of
+# output per chord, so thousands of test chords come out of a single call:
+#
+#   chords = synthesize([[262, 330, 392, 494], [370, 466, 554, 698]], 1, SAMPLE_RATE, 2)
+#
+# Work is done a chunk of samples at a time into buffers that are allocated once,
+# so long durations never build a (tones x samples) array. The phase of every tone
+# is wrapped to within half a cycle in float64 before the sine is taken in float32,
+# so the float32 output stays accurate for hour-long signals.
+#
+
+
+import numpy as np
+
+SAMPLE_RATE = 44100 # Hertz
+CHUNK_SIZE = 16384  # Samples rendered per pass
+SCRATCH_SIZE = 1 << 20 # Most (tone, sample) pairs held in scratch at once
+
+
+class _Tones:
+    def __init__(self, freqs, amps, phases, sample_rate, chunk_size, dtype):
+        freqs, amps, phases = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(freqs, dtype=np.float64)),
+            np.asarray(amps, dtype=dtype),
+            np.asarray(phases, dtype=np.float64)
+        )
+        self.shape = freqs.shape[:-1]
+        self.step = freqs / sample_rate # Cycles per sample
+        self.start_cycles = phases / (2*np.pi)
+        self.amps = np.ascontiguousarray(amps)[..., None, :]
+
+        self.ramp = np.arange(chunk_size, dtype=np.float64)
+        self.cycles = np.empty(freqs.shape + (chunk_size,))
+        self.sines = np.empty(freqs.shape + (chunk_size,), dtype=dtype)
+
+    def render(self, start, out):
+        # Writes samples start .. start+len(out) of the mix into out
+        m = out.shape[-1]
+        cycles = self.cycles[..., :m]
+        sines = self.sines[..., :m]
+
+        offset = np.mod(self.step*start + self.start_cycles, 1)
+        np.multiply.outer(self.step, self.ramp[:m], out=cycles)
+        cycles += offset[..., None]
+
+        # Drop the whole cycles (held exactly in float32 while the sines buffer
+        # is free) so only a phase in [-pi, pi] is handed to float32.
+        np.rint(cycles, out=sines, casting="same_kind")
+        cycles -= sines
+        cycles *= 2*np.pi
+
+        np.copyto(sines, cycles, casting="same_kind")
+        np.sin(sines, out=sines)
+        np.matmul(self.amps, sines, out=out[..., None, :])
+        return out
+
+
+def _n_samples(sample_rate, duration):
+    return int(round(sample_rate * duration))
+
+
+def _scratch_chunk(freqs, amps, phases, chunk_size):
+    # chunk_size, cut down so the (tone, sample) scratch stays within SCRATCH_SIZE
+    tone_shape = np.broadcast_shapes(np.shape(freqs) or (1,), np.shape(amps), np.shape(phases))
+    return max(1, min(chunk_size, SCRATCH_SIZE // int(np.prod(tone_shape))))
+
+
+def synthesize(freqs, amps=1.0, sample_rate=SAMPLE_RATE, duration=1.0, phases=0.0,
+               out=None, dtype=np.float32, chunk_size=CHUNK_SIZE):
+    # Returns sum(amps * sin(2*pi*freqs*t + phases)) over the last axis of freqs.
+    # Pass `out` to reuse the same buffer across calls.
+    n = _n_samples(sample_rate, duration)
+    chunk_size = max(1, min(_scratch_chunk(freqs, amps, phases, chunk_size), n))
+    tones = _Tones(freqs, amps, phases, sample_rate, chunk_size, dtype)
+
+    if out is None:
+        out = np.empty(tones.shape + (n,), dtype=dtype)
+    elif out.shape != tones.shape + (n,):
+        raise ValueError(f"out has shape {out.shape}, expected {tones.shape + (n,)}")
+
+    for start in range(0, n, chunk_size):
+        tones.render(start, out[..., start:start + chunk_size])
+    return out
+
+
+def synthesize_chunks(freqs, amps=1.0, sample_rate=SAMPLE_RATE, duration=1.0, phases=0.0,
+                      dtype=np.float32, chunk_size=CHUNK_SIZE):
+    # Yields the same samples as synthesize() chunk_size at a time. Every chunk is
+    # written into the same buffer, so copy it if you need to keep it past the
+    # next iteration. Chunks bigger than the scratch cap are rendered in pieces.
+    n = _n_samples(sample_rate, duration)
+    chunk_size = max(1, min(chunk_size, n))
+    piece = _scratch_chunk(freqs, amps, phases, chunk_size)
+    tones = _Tones(freqs, amps, phases, sample_rate, piece, dtype)
+    buffer = np.empty(tones.shape + (chunk_size,), dtype=dtype)
+
+    for start in range(0, n, chunk_size):
+        chunk = buffer[..., :min(chunk_size, n - start)]
+        for offset in range(0, chunk.shape[-1], piece):
+            tones.render(start + offset, chunk[..., offset:offset + piece])
+        yield chunk
@@ -0,0 +1,8 @@
+# The modules under test live at the top of the repository, not in a package
+#
+
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,138 @@
+# Headless checks of the signal processing modules (no manim needed)
+#
+#   python -m pytest -q
+#
+
+
+from scipy.integrate import trapezoid
+from scipy.io import wavfile
+from scipy.signal import fftconvolve
+import numpy as np
+import pytest
+
+from filters import FIRFilter
+from pcm import Normalizer, to_pcm
+from signals import adaptive_grid, triangle
+from stream_filter import StreamingFilter
+from sweeps import SweepTable
+from synth import synthesize, synthesize_chunks
+from transforms import numeric_transform, transform
+from wavmap import create_wav, open_wav
+
+SAMPLE_RATE = 44100
+
+
+@pytest.fixture
+def noise():
+    return np.random.default_rng(0).standard_normal((2, 20000))
+
+
+def test_fir_matches_fftconvolve(noise):
+    fir = FIRFilter([(3900, 4100)], SAMPLE_RATE, numtaps=1025)
+    expected = fftconvolve(noise, fir.kernel[None, :], axes=-1)[:, fir.delay:fir.delay + noise.shape[1]]
+    np.testing.assert_allclose(fir.apply_batch(noise), expected, atol=1e-12)
+    np.testing.assert_allclose(fir.apply(noise[0]), expected[0], atol=1e-12)
+
+
+@pytest.mark.parametrize("block_size", [1, 1000, 4096, 30000])
+def test_streaming_identity_filter_reproduces_input(noise, block_size):
+    signal = noise.T
+    engine = StreamingFilter([], SAMPLE_RATE)
+    blocks = [engine.process(signal[start:start + block_size]) for start in range(0, len(signal), block_size)]
+    out = np.concatenate(blocks + [engine.flush()])
+    assert out.shape == signal.shape
+    np.testing.assert_allclose(out, signal, atol=1e-12)
+
+
+def test_wav_round_trip(tmp_path, noise):
+    samples = to_pcm(noise.T)
+    path = tmp_path / "noise.wav"
+    out = create_wav(path, SAMPLE_RATE, len(samples), samples.shape[1])
+    out[:] = samples
+    out.flush()
+    del out
+
+    sample_rate, data = open_wav(path)
+    assert sample_rate == SAMPLE_RATE
+    np.testing.assert_array_equal(data, samples)
+    # and the header is one other readers agree with
+    sample_rate, data = wavfile.read(path)
+    assert sample_rate == SAMPLE_RATE
+    np.testing.assert_array_equal(data, samples)
+
+
+def test_empty_wav_round_trip(tmp_path):
+    path = tmp_path / "empty.wav"
+    create_wav(path, SAMPLE_RATE, 0, 2)
+    sample_rate, data = open_wav(path)
+    assert sample_rate == SAMPLE_RATE
+    assert data.shape == (0, 2)
+
+
+@pytest.mark.parametrize("shape", [(0,), (0, 2)])
+def test_to_pcm_empty(shape):
+    out = to_pcm(np.zeros(shape))
+    assert out.shape == shape
+    assert out.dtype == np.int16
+
+
+def test_to_pcm_silence():
+    np.testing.assert_array_equal(to_pcm(np.zeros((100, 2))), np.zeros((100, 2), np.int16))
+    normalizer = Normalizer()
+    normalizer.update(np.zeros(10))
+    np.testing.assert_array_equal(normalizer.convert(np.zeros(10)), np.zeros(10, np.int16))
+
+
+def test_to_pcm_full_scale():
+    out = to_pcm(np.array([0.5, -1.0, 0.25]))
+    assert out.tolist() == [16384, -32767, 8192]
+
+
+def test_adaptive_grid_within_tolerance():
+    function = lambda x: np.sin(40*x) + np.maximum(0, 1 - np.abs(x))
+    tolerance = 0.01
+    x, y = adaptive_grid(function, (-2, 2), budget=20000, tolerance=tolerance, start=64)
+    assert len(x) < 20000
+    assert np.all(np.diff(x) > 0)
+    np.testing.assert_allclose(y, function(x))
+
+    # The chord is furthest from the curve in the middle of each segment
+    mid = (x[:-1] + x[1:]) / 2
+    assert np.abs(np.interp(mid, x, y) - function(mid)).max() <= tolerance
+
+
+def test_adaptive_grid_smooth_needs_fewer_points():
+    function = lambda x: np.sin(40*x)
+    linear, _ = adaptive_grid(function, (-2, 2), budget=20000, tolerance=0.001, start=64)
+    smooth, _ = adaptive_grid(function, (-2, 2), budget=20000, tolerance=0.001, start=64, smooth=True)
+    assert len(smooth) < len(linear) < 20000
+
+
+def test_adaptive_grid_respects_budget():
+    x, y = adaptive_grid(lambda x: np.sin(500*x), (0, 6), budget=1000, tolerance=1e-6, start=100)
+    assert len(x) == 1000
+
+
+def test_synthesize_chunks_match_synthesize():
+    freqs, amps = [262, 330, 392], [1, 0.5, 0.25]
+    whole = synthesize(freqs, amps, SAMPLE_RATE, 0.5)
+    chunks = np.concatenate([chunk.copy() for chunk in synthesize_chunks(freqs, amps, SAMPLE_RATE, 0.5, chunk_size=3000)])
+    np.testing.assert_allclose(chunks, whole, atol=1e-6)
+
+
+def test_sweep_table_exact_at_stops(tmp_path):
+    x = np.linspace(-10, 10, 500)
+    function = lambda w: np.sin(3*x) * np.sin(w*x)
+    table = SweepTable.cached(function, x, (1, 3, 5), directory=tmp_path)
+    for omega in (1, 3, 5):
+        np.testing.assert_allclose(table.samples(omega), function(omega), atol=1e-6)
+        assert table.area(omega) == pytest.approx(trapezoid(function(omega), x), abs=1e-6)
+    assert SweepTable.cached(function, x, (1, 3, 5), directory=tmp_path).values.shape == table.values.shape
+    with pytest.raises(ValueError):
+        table.samples(5.5)
+
+
+def test_numeric_transform_matches_analytic():
+    w = np.linspace(-20, 20, 81)
+    numeric = numeric_transform(triangle, w, (-2, 2), points=8001)
+    np.testing.assert_allclose(numeric, transform("triangle")(w), atol=1e-6)
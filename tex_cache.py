@@ -0,0 +1,259 @@
+# Manages the hashed Tex/SVG files manim leaves in media/Tex and media/texts
+#
+#   python tex_cache.py warm main.py      # compile every Tex/MathTex/Title string in parallel
+#   python tex_cache.py verify --repair   # drop unreadable or modified cache entries
+#   python tex_cache.py evict --max-size 8M
+#   python tex_cache.py stats
+#
+# Manim only ever adds to these directories. Each one gets a manifest.json here that
+# records, per hash, the files belonging to it, their size, a checksum of the SVG
+# and when it was last used (warm-up counts as a use, as does a render reading the
+# files, seen through their access time), which is what eviction and the
+# integrity checks work from. Anything manim wrote since the last run is picked
+# up automatically.
+#
+
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import ast
+import hashlib
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+
+MEDIA_DIR = Path("media")
+CACHE_DIRS = ("Tex", "texts")
+MANIFEST = "manifest.json"
+
+TEX_CLASSES = ("MathTex", "Tex", "Title")
+# Keyword arguments that change the compiled output. Anything else (colour,
+# font_size, ...) is applied after compiling and can be ignored here.
+TEX_KWARGS = ("arg_separator", "substrings_to_isolate", "tex_environment")
+
+
+def _checksum(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class TexCache:
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        # Missing on a fresh checkout, until manim compiles its first string
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.directory / MANIFEST
+        self.entries = {}
+        if self.manifest_path.exists():
+            self.entries = json.loads(self.manifest_path.read_text())
+        self.scan()
+
+    def scan(self):
+        # Brings the manifest in line with what is on disk
+        files = {}
+        for path in self.directory.iterdir():
+            if path.name != MANIFEST and path.suffix in (".tex", ".svg"):
+                files.setdefault(path.stem, []).append(path)
+
+        for key in list(self.entries):
+            if key not in files:
+                del self.entries[key]
+
+        for key, paths in files.items():
+            entry = self.entries.get(key, {})
+            svg = self.directory / f"{key}.svg"
+            entry["files"] = sorted(path.name for path in paths)
+            entry["size"] = sum(path.stat().st_size for path in paths)
+            # Renders read their cached files without going through here, so the
+            # access time is what tells entries still in use from stale ones
+            used = max(max(path.stat().st_atime, path.stat().st_mtime) for path in paths)
+            entry["last_used"] = max(entry.get("last_used", 0), used)
+            if svg.exists() and "sha256" not in entry:
+                entry["sha256"] = _checksum(svg)
+            self.entries[key] = entry
+
+    def save(self):
+        self.manifest_path.write_text(json.dumps(self.entries, indent=1, sort_keys=True))
+
+    def size(self):
+        return sum(entry["size"] for entry in self.entries.values())
+
+    def touch(self, key, now=None):
+        if key in self.entries:
+            self.entries[key]["last_used"] = now or time.time()
+
+    def remove(self, key):
+        for name in self.entries.pop(key)["files"]:
+            (self.directory / name).unlink(missing_ok=True)
+
+    def verify(self):
+        # Returns {hash: problem} for every entry manim could not safely reuse
+        problems = {}
+        for key, entry in self.entries.items():
+            svg = self.directory / f"{key}.svg"
+            if not svg.exists():
+                problems[key] = "no svg (compile failed or was interrupted)"
+                continue
+            if svg.stat().st_size == 0:
+                problems[key] = "empty svg"
+                continue
+            try:
+                ET.parse(svg)
+            except ET.ParseError as e:
+                problems[key] = f"unreadable svg ({e})"
+                continue
+            if entry.get("sha256") != _checksum(svg):
+                problems[key] = "svg changed since it was indexed"
+        return problems
+
+    def evict(self, max_size):
+        # Removes least recently used entries until the directory fits in max_size
+        removed = []
+        by_age = sorted(self.entries, key=lambda key: self.entries[key]["last_used"])
+        total = self.size()
+        for key in by_age:
+            if total <= max_size:
+                break
+            total -= self.entries[key]["size"]
+            self.remove(key)
+            removed.append(key)
+        return removed
+
+
+# ===== Warm-up =====
+
+def _literal(node, constants):
+    if isinstance(node, ast.Name) and node.id in constants:
+        return constants[node.id]
+    return ast.literal_eval(node)
+
+
+def find_tex_calls(scene_file):
+    # Returns (class name, args, kwargs) for every Tex-like call in a scene file
+    # whose arguments are plain strings, or module-level string constants.
+    # f-strings and other computed arguments are skipped, as they can only be
+    # known while rendering.
+    tree = ast.parse(Path(scene_file).read_text())
+
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    constants[target.id] = node.value.value
+
+    calls, skipped = [], 0
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in TEX_CLASSES):
+            continue
+        try:
+            args = tuple(_literal(arg, constants) for arg in node.args)
+            kwargs = tuple(
+                (kw.arg, _literal(kw.value, constants))
+                for kw in node.keywords if kw.arg in TEX_KWARGS
+            )
+        except (ValueError, TypeError):
+            skipped += 1
+            continue
+        if args and all(isinstance(arg, str) for arg in args):
+            calls.append((node.func.id, args, kwargs))
+
+    return list(dict.fromkeys(calls)), skipped
+
+
+def _init_worker(media_dir):
+    from manim import config
+    config.media_dir = str(media_dir)
+
+
+def _compile(call):
+    # Runs in a worker process. Building the mobject goes through manim's own
+    # tex pipeline, so the files land exactly where a render would look for them.
+    import manim
+
+    name, args, kwargs = call
+    try:
+        mob = getattr(manim, name)(*args, **dict(kwargs))
+    except Exception as e:
+        return call, [], f"{type(e).__name__}: {e}"
+    svgs = [Path(sub.file_name).stem for sub in mob.get_family() if getattr(sub, "file_name", None)]
+    return call, svgs, None
+
+
+def warm(scene_files, media_dir=MEDIA_DIR, workers=None):
+    calls = []
+    for scene_file in scene_files:
+        found, skipped = find_tex_calls(scene_file)
+        print(f"{scene_file}: {len(found)} tex strings ({skipped} computed at render time, skipped)")
+        calls += found
+    calls = list(dict.fromkeys(calls))
+
+    tex = TexCache(Path(media_dir) / "Tex")
+    before = set(tex.entries)
+    used = set()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(media_dir,)) as pool:
+        for call, keys, error in pool.map(_compile, calls, chunksize=4):
+            used.update(keys)
+            if error:
+                print(f"failed: {call[0]}{call[1]}: {error}")
+
+    tex.scan()
+    now = time.time()
+    for key in used:
+        tex.touch(key, now)
+    tex.save()
+
+    print(f"{len(calls)} strings, {len(used - before)} compiled, {len(used & before)} already cached, "
+          f"{time.perf_counter() - start:.1f} s")
+
+
+def _parse_size(text):
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index, check and trim manim's Tex/SVG caches.")
+    parser.add_argument("--media-dir", type=Path, default=MEDIA_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    warm_parser = commands.add_parser("warm", help="precompile every tex string used in scene files")
+    warm_parser.add_argument("scene_files", nargs="+")
+    warm_parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+
+    verify_parser = commands.add_parser("verify", help="check every cached svg")
+    verify_parser.add_argument("--repair", action="store_true", help="delete broken entries so manim rebuilds them")
+
+    evict_parser = commands.add_parser("evict", help="drop least recently used entries")
+    evict_parser.add_argument("--max-size", required=True, help="per directory, e.g. 8M")
+
+    commands.add_parser("stats")
+    args = parser.parse_args()
+
+    if args.command == "warm":
+        warm(args.scene_files, args.media_dir, args.workers)
+
+    for name in CACHE_DIRS:
+        if args.command == "warm" or not (args.media_dir / name).is_dir():
+            continue
+        cache = TexCache(args.media_dir / name)
+
+        if args.command == "verify":
+            problems = cache.verify()
+            print(f"{name}: {len(cache.entries)} entries, {len(problems)} broken")
+            for key, problem in sorted(problems.items()):
+                print(f"  {key}: {problem}")
+                if args.repair:
+                    cache.remove(key)
+        elif args.command == "evict":
+            removed = cache.evict(_parse_size(args.max_size))
+            print(f"{name}: removed {len(removed)} entries, {cache.size() / (1 << 20):.1f} MB left")
+        elif args.command == "stats":
+            print(f"{name}: {len(cache.entries)} entries, {cache.size() / (1 << 20):.1f} MB")
+
+        cache.save()
@@ -0,0 +1,165 @@
+# Fourier transforms of the signals used in the scenes
+#
+#   F = transform("cos", 5*PI)        # pi[delta(w - 5pi) + delta(w + 5pi)]
+#   F.impulses                        # ((-5pi, pi), (5pi, pi))
+#   F.real(w), F.imag(w)              # continuous part, vectorised over w
+#   w, Fw = sample_transform("triangle", (-12*PI, 12*PI), 1001)
+#
+# Uses F(w) = integral of f(t) e^(-iwt) dt, as in the scenes. Each transform is
+# split into Dirac impulses (position, weight), which the scenes draw as arrows
+# labelled infinity, and a continuous part, which they plot. The standard
+# signals below are done analytically. Anything else registered in
+# signals.SIGNALS is integrated numerically over a finite t window, with the
+# trapezoid rule over the whole w-grid at once. Transforms and sampled grids
+# are cached, so drawing the same spectrum twice costs nothing.
+#
+
+
+from functools import lru_cache
+
+import numpy as np
+
+from signals import SIGNALS
+
+CACHE_SIZE = 64
+POINTS = 4001 # t samples for numeric transforms
+CHUNK_SIZE = 1 << 22 # (w, t) pairs evaluated at once
+
+
+class Transform:
+    def __init__(self, impulses=(), continuous=None):
+        # impulses: (w, complex weight) pairs; continuous: vectorised w -> F(w)
+        self.impulses = tuple(sorted((float(w), complex(weight)) for w, weight in impulses))
+        self.continuous = continuous
+
+    def __call__(self, w):
+        w = np.asarray(w, dtype=np.float64)
+        if self.continuous is None:
+            return np.zeros(w.shape, dtype=np.complex128)
+        return np.broadcast_to(np.asarray(self.continuous(w), dtype=np.complex128), w.shape)
+
+    def real(self, w):
+        return self(w).real
+
+    def imag(self, w):
+        return self(w).imag
+
+    def __add__(self, other):
+        if self.continuous is None or other.continuous is None:
+            continuous = self.continuous or other.continuous
+        else:
+            continuous = lambda w, a=self.continuous, b=other.continuous: a(w) + b(w)
+        return Transform(_merge(self.impulses + other.impulses), continuous)
+
+    def scaled(self, factor):
+        continuous = None if self.continuous is None else lambda w, f=self.continuous: factor * f(w)
+        return Transform(((w, factor * weight) for w, weight in self.impulses), continuous)
+
+
+def _merge(impulses):
+    # Adds the weights of impulses at the same w and drops any that cancel
+    total = {}
+    for w, weight in impulses:
+        total[w] = total.get(w, 0) + weight
+    return [(w, weight) for w, weight in total.items() if abs(weight) > 1e-12]
+
+
+# ===== Analytic transforms =====
+
+def impulse(t0=0.0):
+    # delta(t - t0) -> e^(-i w t0)
+    return Transform(continuous=lambda w: np.exp(-1j*w*t0))
+
+
+def constant(a=1.0):
+    # a -> 2 pi a delta(w)
+    return Transform([(0.0, 2*np.pi*a)])
+
+
+def cos(w0, a=1.0):
+    # a cos(w0 t) -> a pi [delta(w - w0) + delta(w + w0)]
+    return Transform(_merge([(w0, np.pi*a), (-w0, np.pi*a)]))
+
+
+def sin(w0, a=1.0):
+    # a sin(w0 t) -> i a pi [delta(w + w0) - delta(w - w0)]
+    return Transform(_merge([(-w0, 1j*np.pi*a), (w0, -1j*np.pi*a)]))
+
+
+def chord(freqs, amps=1.0):
+    # Sum of a sin(w t), the form of the chords in main.py
+    amps = np.broadcast_to(amps, np.shape(freqs))
+    total = Transform()
+    for w0, a in zip(freqs, amps):
+        total = total + sin(w0, a)
+    return total
+
+
+def rect(width=1.0):
+    # 1 for |t| < width/2 -> width sinc(w width / 2 pi)
+    return Transform(continuous=lambda w: width * np.sinc(w*width / (2*np.pi)))
+
+
+def triangle(width=1.0):
+    # Lambda(t/width), 1 - |t|/width for |t| < width -> width sinc^2(w width / 2 pi)
+    return Transform(continuous=lambda w: width * np.sinc(w*width / (2*np.pi))**2)
+
+
+ANALYTIC = {
+    "impulse": impulse,
+    "constant": constant,
+    "cos": cos,
+    "sin": sin,
+    "chord": chord,
+    "rect": rect,
+    "triangle": triangle,
+}
+
+
+@lru_cache(CACHE_SIZE)
+def transform(name, *params):
+    # The Transform of a signal in ANALYTIC with the given parameters. Cached,
+    # so params must be hashable (tuples rather than lists for chords).
+    return ANALYTIC[name](*params)
+
+
+# ===== Numeric transforms =====
+
+def numeric_transform(function, w, t_range, points=POINTS):
+    # F(w) of function(t) over t_range only, trapezoid rule on `points` samples.
+    # Signals that do not die away within t_range come out as the transform of
+    # that window of them (finite peaks where the exact answer has impulses).
+    t = np.linspace(t_range[0], t_range[1], points)
+    weights = np.full(points, t[1] - t[0])
+    weights[[0, -1]] /= 2
+    f = np.asarray(function(t), dtype=np.complex128) * weights
+
+    w = np.asarray(w, dtype=np.float64)
+    flat = w.reshape(-1)
+    out = np.empty(flat.shape, dtype=np.complex128)
+    rows = max(1, CHUNK_SIZE // points)
+    for start in range(0, len(flat), rows):
+        out[start:start + rows] = np.exp(-1j*np.multiply.outer(flat[start:start + rows], t)) @ f
+    return out.reshape(w.shape)
+
+
+@lru_cache(CACHE_SIZE)
+def _sample(name, params, w_min, w_max, num, t_range, points):
+    w = np.linspace(w_min, w_max, num)
+    if name in ANALYTIC:
+        values = transform(name, *params)(w)
+    else:
+        if t_range is None:
+            raise ValueError(f"{name!r} has no analytic transform, give a t_range to integrate over")
+        values = numeric_transform(SIGNALS[name], w, t_range, points)
+    w.setflags(write=False)
+    values.setflags(write=False)
+    return w, values
+
+
+def sample_transform(name, w_range, num, params=(), t_range=None, points=POINTS):
+    # Returns read-only (w, F(w)) on num points across w_range: analytic for the
+    # signals in ANALYTIC (continuous part only), otherwise numeric for a signal
+    # registered in signals.SIGNALS, integrated over t_range.
+    t_range = None if t_range is None else (float(t_range[0]), float(t_range[1]))
+    return _sample(name, tuple(params), float(w_range[0]), float(w_range[1]), int(num), t_range, int(points))
@@ -0,0 +1,112 @@
+# Memory-mapped WAV files
+#
+#   sample_rate, data = open_wav("noisy.wav")          # (frames, channels) view of the file
+#   window = data[44100*60 : 44100*61]                  # one second, nothing read yet
+#
+#   out = create_wav("clean.wav", sample_rate, len(data), data.shape[1])
+#   out[:len(block)] = block                            # goes straight to the file
+#   out.flush()
+#
+# The sample data of a PCM or float WAV is one contiguous block after the header,
+# so it can be handed to NumPy as a np.memmap. Slicing it costs nothing and only
+# the pages actually touched are read from disk, so a multi-gigabyte recording
+# opens instantly and uses no more memory than the part being worked on.
+# create_wav writes the header for a file of a known length and maps its data
+# block for writing.
+#
+
+
+from collections import namedtuple
+import struct
+
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (format, bits per sample) -> sample dtype. 24-bit PCM has no NumPy dtype to map.
+DTYPES = {
+    (WAVE_FORMAT_PCM, 8): np.dtype("u1"),
+    (WAVE_FORMAT_PCM, 16): np.dtype("<i2"),
+    (WAVE_FORMAT_PCM, 32): np.dtype("<i4"),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): np.dtype("<f4"),
+    (WAVE_FORMAT_IEEE_FLOAT, 64): np.dtype("<f8"),
+}
+
+WavInfo = namedtuple("WavInfo", "sample_rate channels dtype frames offset")
+
+
+def wav_info(path):
+    # Reads the header of a WAV file and finds where its sample data starts
+    with open(path, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError(f"{path} is not a RIFF/WAVE file")
+
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            chunk_id, size = struct.unpack("<4sI", header)
+
+            if chunk_id == b"fmt ":
+                fmt = f.read(size)
+            elif chunk_id == b"data":
+                offset = f.tell()
+                break
+            else:
+                f.seek(size, 1)
+            f.seek(size % 2, 1) # Chunks are padded to an even length
+
+    if fmt is None:
+        raise ValueError(f"{path} has no fmt chunk")
+    format_tag, channels, sample_rate, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if format_tag == WAVE_FORMAT_EXTENSIBLE:
+        format_tag = struct.unpack("<H", fmt[24:26])[0]
+    if (format_tag, bits) not in DTYPES:
+        raise ValueError(f"unsupported WAV format {format_tag:#x} with {bits} bits per sample")
+
+    # A data chunk still being written can claim more than the file holds
+    with open(path, "rb") as f:
+        available = f.seek(0, 2) - offset
+    return WavInfo(sample_rate, channels, DTYPES[format_tag, bits], min(size, available) // block_align, offset)
+
+
+def open_wav(path, mode="r"):
+    # Returns (sample_rate, (frames, channels) memmap). mode="r+" writes changes
+    # back to the file, "c" keeps them in memory.
+    info = wav_info(path)
+    if info.frames == 0:
+        return info.sample_rate, np.zeros((0, info.channels), info.dtype)
+    data = np.memmap(path, info.dtype, mode, info.offset, (info.frames, info.channels))
+    return info.sample_rate, data
+
+
+def create_wav(path, sample_rate, frames, channels=1, dtype="<i2"):
+    # Writes the header of a WAV file of frames samples per channel and returns
+    # its (frames, channels) data block mapped for writing. The data starts out
+    # as zeros.
+    dtype = np.dtype(dtype).newbyteorder("<")
+    for (format_tag, bits), known in DTYPES.items():
+        if known == dtype:
+            break
+    else:
+        raise ValueError(f"can't write {dtype} samples to a WAV file")
+
+    block_align = channels * dtype.itemsize
+    data_size = frames * block_align
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size + data_size % 2, b"WAVE",
+        b"fmt ", 16, format_tag, channels, sample_rate, sample_rate*block_align, block_align, bits,
+        b"data", data_size
+    )
+    with open(path, "wb") as f:
+        f.write(header)
+        f.truncate(len(header) + data_size + data_size % 2)
+
+    if data_size == 0:
+        return np.zeros((0, channels), dtype)
+    return np.memmap(path, dtype, "r+", len(header), (frames, channels))